@@ -0,0 +1,319 @@
+"""Headless benchmark of the main screen of the application.
+
+Generates stores of increasing size, runs the application against each of
+them without a terminal, and measures how long it takes for the years list
+to first appear, and how long it takes for the dependent panes to be fully
+populated after the highlight moves in the years, months and days lists.
+
+Run with:
+
+    python -m benchmarks.tui
+
+The results are compared with those held in `benchmarks/baseline.json` and
+any that are notably slower are reported as regressions; use `--save` to
+record a new baseline.
+"""
+
+##############################################################################
+# Python imports.
+import asyncio
+import os
+import sys
+from argparse   import ArgumentParser, Namespace
+from datetime   import datetime, timedelta
+from functools  import partial
+from json       import dumps, loads
+from pathlib    import Path
+from random     import Random
+from statistics import median
+from tempfile   import TemporaryDirectory
+from time       import perf_counter
+from typing     import Callable, Final, TypeAlias
+
+##############################################################################
+# Textual imports.
+from textual.widgets import ListItem, ListView
+
+##############################################################################
+# Local imports.
+from feeling.chui         import Feeling as FeelingApp
+from feeling.data         import Feeling, Feelings, Scale, save
+from feeling.screens      import Main
+from feeling.screens.main import FeelingItem
+
+##############################################################################
+BASELINE: Final = Path( __file__ ).parent / "baseline.json"
+"""The file that holds the baseline results."""
+
+SIZES: Final = ( 1_000, 5_000, 20_000 )
+"""The default sizes of store to benchmark against."""
+
+MOVES: Final = 6
+"""The default number of highlight moves to time in each column."""
+
+TOLERANCE: Final = 0.5
+"""The default fraction by which a result can be slower than the baseline."""
+
+TIMEOUT: Final = 120.0
+"""How long, in seconds, to wait for the screen to settle before giving up."""
+
+POLL: Final = 0.001
+"""How often, in seconds, to check if the screen has settled."""
+
+WORDS: Final = ( "work", "sleep", "tired", "happy", "gym", "family", "rain", "coffee" )
+"""Words to make up the descriptions of the generated feelings."""
+
+##############################################################################
+Results: TypeAlias = dict[ str, dict[ str, dict[ str, float ] ] ]
+"""The type of the results, keyed by mode, then store size, then measurement."""
+
+##############################################################################
+def generate( size: int ) -> None:
+    """Generate a store of feelings in the current data directory.
+
+    Args:
+        size: The number of feelings to generate.
+
+    Note:
+        The store is the same for any given size, so that results can be
+        compared from one run to the next.
+    """
+    random   = Random( size )
+    start    = datetime( 2015, 1, 1 )
+    span     = int( ( datetime( 2024, 1, 1 ) - start ).total_seconds() )
+    feelings = Feelings()
+    for _ in range( size ):
+        feelings.add( Feeling(
+            start + timedelta( seconds=random.randrange( span ), microseconds=random.randrange( 1_000_000 ) ),
+            Scale( random.randint( -2, 2 ) ),
+            " ".join( random.choices( WORDS, k=random.randint( 1, 12 ) ) )
+        ) )
+    save( feelings )
+
+##############################################################################
+async def wait_for( condition: Callable[ [], bool ] ) -> float:
+    """Wait for a condition to become true.
+
+    Args:
+        condition: The condition to wait for.
+
+    Returns:
+        The time, in seconds, at which the condition became true.
+
+    Raises:
+        TimeoutError: If the condition didn't become true in time.
+    """
+    give_up = perf_counter() + TIMEOUT
+    while not condition():
+        if perf_counter() > give_up:
+            raise TimeoutError( "The screen didn't settle in time" )
+        await asyncio.sleep( POLL )
+    return perf_counter()
+
+##############################################################################
+def painted( pane: ListView ) -> bool:
+    """Has a list been populated and laid out on the screen?
+
+    Args:
+        pane: The list to check.
+
+    Returns:
+        `True` if the list has items and the first of them is on screen.
+    """
+    return bool( pane.children ) and pane.children[ 0 ].region.area > 0
+
+##############################################################################
+def settled( screen: Main ) -> bool:
+    """Have all of the panes caught up with the highlights?
+
+    Args:
+        screen: The screen to check.
+
+    Returns:
+        `True` if every column shows the details of the item highlighted in
+        the column to its left, and the last of them has been painted.
+    """
+    source: ListView = screen.years
+    for column in ( screen.months, screen.days, screen.feelings ):
+        if not isinstance( item := source.highlighted_child, FeelingItem ) or column.current != item.pane:
+            return False
+        source = column.get_child_by_id( item.pane, ListView )
+    return painted( source )
+
+##############################################################################
+def moved( screen: Main, pane: ListView, was: ListItem | None ) -> bool:
+    """Has the highlight moved on in a list, and the screen caught up with it?
+
+    Args:
+        screen: The screen that the list is on.
+        pane: The list the highlight is moving in.
+        was: The item that was highlighted before the move.
+
+    Returns:
+        `True` if the highlight has moved and the screen has settled.
+    """
+    return pane.highlighted_child is not was and settled( screen )
+
+##############################################################################
+async def time_moves( screen: Main, pane: ListView, moves: int ) -> tuple[ list[ float ], list[ float ] ]:
+    """Time moving the highlight down and then back up a list.
+
+    Args:
+        screen: The screen that the list is on.
+        pane: The list to move the highlight in.
+        moves: The number of moves to make in each direction.
+
+    Returns:
+        The times taken moving down, to items that hadn't been shown
+        before, and moving back up, to items that had.
+    """
+    moves = min( moves, len( pane.children ) - 1 )
+    cold: list[ float ] = []
+    warm: list[ float ] = []
+    for times, move in ( ( cold, pane.action_cursor_down ), ( warm, pane.action_cursor_up ) ):
+        for _ in range( moves ):
+            was   = pane.highlighted_child
+            start = perf_counter()
+            move()
+            times.append( await wait_for( partial( moved, screen, pane, was ) ) - start )
+    return cold, warm
+
+##############################################################################
+async def measure( budget: int | None, moves: int ) -> dict[ str, float ]:
+    """Measure the application against the current data directory.
+
+    Args:
+        budget: The memory budget to run the application with.
+        moves: The number of highlight moves to time in each column.
+
+    Returns:
+        The measurements, in seconds.
+    """
+    results: dict[ str, float ] = {}
+    start = perf_counter()
+    app   = FeelingApp( budget )
+    async with app.run_test( size=( 160, 50 ) ):
+        await wait_for( lambda: isinstance( app.screen, Main ) )
+        assert isinstance( screen := app.screen, Main )
+        results[ "first_paint" ] = await wait_for( lambda: painted( screen.years ) ) - start
+        results[ "loaded" ]      = await wait_for( lambda: not screen.loading and settled( screen ) ) - start
+        column: ListView = screen.years
+        for name, next_column in (
+            ( "years", screen.months ), ( "months", screen.days ), ( "days", screen.feelings )
+        ):
+            column.focus()
+            cold, warm = await time_moves( screen, column, moves )
+            if cold:
+                results[ f"{name}_cold" ] = median( cold )
+                results[ f"{name}_warm" ] = median( warm )
+            column = next_column.get_child_by_id( str( next_column.current ), ListView )
+    return results
+
+##############################################################################
+def benchmark( sizes: list[ int ], memory: int | None, moves: int ) -> Results:
+    """Run the benchmark.
+
+    Args:
+        sizes: The sizes of store to run against.
+        memory: The memory budget, in megabytes, to also run with, if any.
+        moves: The number of highlight moves to time in each column.
+
+    Returns:
+        The results.
+    """
+    results: Results = {}
+    modes: list[ tuple[ str, int | None ] ] = [ ( "full", None ) ]
+    if memory is not None:
+        modes.append( ( f"memory-{memory}", memory * 1024 * 1024 ) )
+    for size in sizes:
+        with TemporaryDirectory() as data, TemporaryDirectory() as runtime:
+            # Point at a fresh data directory and somewhere the daemon
+            # can't be, so that only the generated store is used.
+            os.environ[ "XDG_DATA_HOME" ]   = data
+            os.environ[ "XDG_RUNTIME_DIR" ] = runtime
+            print( f"Generating {size} feelings...", file=sys.stderr )
+            generate( size )
+            for mode, budget in modes:
+                print( f"Measuring {size} feelings ({mode})...", file=sys.stderr )
+                results.setdefault( mode, {} )[ str( size ) ] = asyncio.run( measure( budget, moves ) )
+    return results
+
+##############################################################################
+def report( results: Results, baseline: Results, tolerance: float ) -> list[ str ]:
+    """Report the results, compared with the baseline.
+
+    Args:
+        results: The results to report.
+        baseline: The baseline to compare with.
+        tolerance: The fraction by which a result can be slower than the baseline.
+
+    Returns:
+        A description of each of the results that regressed.
+    """
+    regressions: list[ str ] = []
+    for mode, sizes in results.items():
+        for size, measurements in sizes.items():
+            print( f"{mode}, {size} feelings:" )
+            for name, seconds in measurements.items():
+                compared = ""
+                if ( was := baseline.get( mode, {} ).get( size, {} ).get( name ) ) is not None:
+                    compared = f" (baseline {was * 1000:9.2f}ms, {( seconds - was ) / was:+7.1%})"
+                    if seconds > was * ( 1 + tolerance ):
+                        regressions.append( f"{mode}, {size} feelings, {name}{compared}" )
+                print( f"  {name:<12} {seconds * 1000:9.2f}ms{compared}" )
+    return regressions
+
+##############################################################################
+def get_args() -> Namespace:
+    """Get the command line arguments.
+
+    Returns:
+        The command line arguments.
+    """
+    parser = ArgumentParser(
+        prog="python -m benchmarks.tui",
+        description="Benchmark the main screen against generated stores."
+    )
+    parser.add_argument(
+        "sizes", type=int, nargs="*", default=list( SIZES ),
+        help=f"The sizes of store to benchmark against (default: {' '.join( str( size ) for size in SIZES )})"
+    )
+    parser.add_argument(
+        "-m", "--memory", type=int, metavar="MB",
+        help="Also benchmark browsing with the given memory budget"
+    )
+    parser.add_argument(
+        "--moves", type=int, default=MOVES,
+        help=f"The number of highlight moves to time in each column (default: {MOVES})"
+    )
+    parser.add_argument(
+        "-t", "--tolerance", type=float, default=TOLERANCE,
+        help=f"The fraction by which a result can be slower than the baseline (default: {TOLERANCE})"
+    )
+    parser.add_argument(
+        "-s", "--save", action="store_true",
+        help="Save the results as the new baseline"
+    )
+    return parser.parse_args()
+
+##############################################################################
+def main() -> None:
+    """Main entry point for the benchmark."""
+    args     = get_args()
+    results  = benchmark( args.sizes, args.memory, args.moves )
+    baseline = loads( BASELINE.read_text() ) if BASELINE.exists() else {}
+    regressions = report( results, baseline, args.tolerance )
+    if args.save:
+        BASELINE.write_text( dumps( results, indent=4 ) + "\n" )
+        print( f"Saved the results as the baseline in {BASELINE}" )
+    elif regressions:
+        print( "\nRegressions:" )
+        for regression in regressions:
+            print( f"  {regression}" )
+        sys.exit( 1 )
+
+##############################################################################
+if __name__ == "__main__":
+    main()
+
+### tui.py ends here
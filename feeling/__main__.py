@@ -2,15 +2,20 @@
 
 ##############################################################################
 # Local imports.
-from . import cli, chui
+from . import cli
 
 ##############################################################################
 def main() -> None:
     """Main entry point."""
     # If the CLI didn't handle this invocation...
-    if not cli.run():
-        # ...go with the full CHUI.
-        chui.run()
+    if ( args := cli.run() ) is not None:
+        # ...go with the full CHUI. This is imported here, rather than at
+        # the top level, so that the CLI doesn't pay the cost of importing
+        # Textual when it doesn't need it.
+        #
+        # pylint:disable=import-outside-toplevel
+        from . import chui
+        chui.run( cli.memory_budget( args ), cli.store_homes( args ) )
 
 ##############################################################################
 # Run the app if we're being called as the main entry point.
@@ -0,0 +1,38 @@
+"""Code for making changes to the recorded feelings."""
+
+##############################################################################
+# Local imports.
+from .             import daemon
+from .data         import Feeling, Feelings, save
+from .data.storage import delete as delete_record
+
+##############################################################################
+def record( feeling: Feeling ) -> None:
+    """Record a new feeling, or a new version of an existing feeling.
+
+    Args:
+        feeling: The feeling to record.
+
+    Note:
+        If the daemon is running the feeling is handed to it, otherwise it
+        is saved directly to the store.
+    """
+    if not daemon.record( feeling ):
+        ( feelings := Feelings() ).add( feeling )
+        save( feelings )
+
+##############################################################################
+def delete( feeling: Feeling ) -> None:
+    """Delete a feeling.
+
+    Args:
+        feeling: The feeling to delete.
+
+    Note:
+        If the daemon is running the deletion is handed to it, otherwise
+        the feeling is deleted directly from the store.
+    """
+    if not daemon.delete( feeling ):
+        delete_record( feeling )
+
+### changes.py ends here
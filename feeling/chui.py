@@ -1,5 +1,10 @@
 """The CHUI entry point."""
 
+##############################################################################
+# Python imports.
+from pathlib import Path
+from typing  import Sequence
+
 ##############################################################################
 # Textual imports.
 from textual.app import App
@@ -19,16 +24,33 @@ class Feeling( App[ None ] ):
     SUB_TITLE  = f"The simple terminal feeling tracker - v{__version__}"
     """The subtitle of the application."""
 
-    SCREENS = { "main": Main }
-    """The screens for the application."""
+    def __init__( self, budget: int | None=None, homes: Sequence[ Path ] | None=None ) -> None:
+        """Initialise the application.
+
+        Args:
+            budget: The rough number of bytes of records to hold in memory,
+                or `None` to hold them all.
+            homes: The homes of the stores to show the feelings of, or
+                `None` for just the local store.
+        """
+        super().__init__()
+        self._budget = budget
+        self._homes  = homes
 
     def on_mount( self ) -> None:
         """Initialise the application on startup."""
-        self.push_screen( "main" )
+        self.push_screen( Main( self._budget, self._homes ) )
 
 ##############################################################################
-def run() -> None:
-    """Run the application."""
-    Feeling().run()
+def run( budget: int | None=None, homes: Sequence[ Path ] | None=None ) -> None:
+    """Run the application.
+
+    Args:
+        budget: The rough number of bytes of records to hold in memory, or
+            `None` to hold them all.
+        homes: The homes of the stores to show the feelings of, or `None`
+            for just the local store.
+    """
+    Feeling( budget, homes ).run()
 
 ### chui.py ends here
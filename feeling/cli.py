@@ -2,16 +2,68 @@
 
 ##############################################################################
 # Python imports.
-from argparse import ArgumentParser, Namespace
+import re
+import sys
+from argparse           import SUPPRESS, Action, ArgumentParser, Namespace
+from datetime           import date, timedelta
+from pathlib            import Path
+from typing             import Any, Callable, Final, NoReturn, Sequence
 
 ##############################################################################
-# Textual imports.
-from textual import __version__ as __textual_version__
+# Local imports.
+from .              import __version__, daemon
+from .changes       import record, delete as delete_feeling
+from .data          import Feeling, Scale, Tally, scale_names, scale_from_name, load_feelings
+from .data.check    import Problem, check, quarantine, repair
+from .data.manifest import forget
+from .data.storage  import day_files, feelings_home, load_aggregates, load_keywords
+from .data.streaks  import Streaks
+from .data.sync     import Prefer, sync as sync_stores
 
 ##############################################################################
-# Local imports.
-from .     import __version__
-from .data import Feelings, scale_names, scale_from_name, save
+STORE_HELP: Final = (
+    "Also include the feelings held in another store (a directory laid out like your own "
+    "feelings directory); can be given more than once."
+)
+"""The help for the argument that adds another store to what's viewed."""
+
+##############################################################################
+class ShowVersion( Action ):
+    """An argument action that shows the version information and exits.
+
+    Unlike argparse's own version action, the version information is only
+    worked out when the argument is actually given.
+    """
+
+    def __init__( self, option_strings: Sequence[ str ], dest: str, **kwargs: Any ) -> None:
+        """Initialise the action.
+
+        Args:
+            option_strings: The option strings for the argument.
+            dest: The name of the attribute the argument would be held in.
+            kwargs: Any other keyword arguments for the action.
+        """
+        super().__init__( option_strings, dest, nargs=0, default=SUPPRESS, **kwargs )
+
+    def __call__(
+            self, parser: ArgumentParser, namespace: Namespace, values: Any, option_string: str | None=None
+    ) -> NoReturn:
+        """Show the version information and exit.
+
+        Args:
+            parser: The parser that's handling the argument.
+            namespace: The namespace the arguments are being parsed into.
+            values: The values given with the argument.
+            option_string: The option string that was used.
+        """
+
+        # Finding the version of Textual is relatively expensive, and
+        # nothing else needs it, so only pull this in when it's needed.
+        #
+        # pylint:disable=import-outside-toplevel
+        from importlib.metadata import version
+
+        parser.exit( message=f"{parser.prog} {__version__} (Textual v{version( 'textual' )})\n" )
 
 ##############################################################################
 def get_args() -> tuple[ Namespace, list[ str ] ]:
@@ -23,15 +75,30 @@ def get_args() -> tuple[ Namespace, list[ str ] ]:
     parser = ArgumentParser(
         prog        = "feeling",
         description = "A simple terminal-based feelings tracker.",
-        epilog      = f"v{__version__}"
+        epilog      = f"Other commands: {', '.join( sorted( COMMANDS ) )}. v{__version__}"
     )
 
     # Add --version
     parser.add_argument(
         "-v", "--version",
         help    = "Show version information.",
-        action  = "version",
-        version = f"%(prog)s {__version__} (Textual v{__textual_version__})"
+        action  = ShowVersion
+    )
+
+    # Add --memory
+    parser.add_argument(
+        "-m", "--memory",
+        help = "Browse the history holding roughly this many megabytes of records in memory.",
+        type = int
+    )
+
+    # Add --store
+    parser.add_argument(
+        "-s", "--store",
+        help    = STORE_HELP,
+        metavar = "STORE",
+        type    = Path,
+        action  = "append"
     )
 
     # Add the optional rating parameter.
@@ -53,30 +120,487 @@ def save_feeling( rating: str, description: str ) -> None:
         rating: The rating for the feeling.
         description: The description for the feeling.
     """
-    ( feelings := Feelings() ).record( scale_from_name( rating ), description=description )
-    save( feelings )
+    record( Feeling( feeling=scale_from_name( rating ), description=description ) )
     if description:
         print( f"Recorded '{description}' rated {rating}" )
     else:
         print( f"Recorded a feeling rated {rating}" )
 
 ##############################################################################
-def run() -> bool:
+WHEN_HELP: Final = (
+    "When the feeling was recorded, as YYYY-MM-DD HH:MM:SS (or as much of that "
+    "as picks out just one feeling), or 'last' for the most recent feeling."
+)
+"""The help for the argument that says which feeling a command works on."""
+
+##############################################################################
+def find_feeling( parser: ArgumentParser, when: str ) -> Feeling:
+    """Find the feeling that a command is to work on.
+
+    Args:
+        parser: The parser for the command, used to report any problems.
+        when: When the feeling was recorded; see `WHEN_HELP`.
+
+    Returns:
+        The feeling.
+
+    Note:
+        If the daemon is running it's asked first, so that feelings it has
+        yet to save can be found too.
+    """
+    if when == "last":
+        if not ( latest := ( daemon.aggregates() or load_aggregates() ).latest ):
+            parser.error( "No feelings have been recorded" )
+        return latest[ 0 ]
+    try:
+        day = date.fromisoformat( when[ :10 ] )
+    except ValueError:
+        parser.error( f"'{when}' doesn't start with a date (YYYY-MM-DD)" )
+    if ( recorded := daemon.for_day( f"{day:%Y}", f"{day:%m}", f"{day:%d}" ) ) is None:
+        recorded = load_feelings( day_files( f"{day:%Y}", f"{day:%m}", f"{day:%d}" ), tolerant=True )
+    prefix  = when.replace( " ", "T" )
+    matches = [ feeling for feeling in recorded if feeling.key.startswith( prefix ) ]
+    if not matches:
+        parser.error( f"No feeling was recorded at {when}" )
+    if len( matches ) > 1:
+        parser.error( "\n".join( [
+            f"{len( matches )} feelings were recorded at {when}; be more specific:",
+            *( f"  {feeling.key} {feeling.feeling.name.lower():9} {feeling.description}" for feeling in matches )
+        ] ) )
+    return matches[ 0 ]
+
+##############################################################################
+def edit( arguments: list[ str ] ) -> None:
+    """Edit a recorded feeling.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling edit",
+        description = "Change the rating and/or the description of a recorded feeling."
+    )
+    parser.add_argument( "when", help=WHEN_HELP )
+    parser.add_argument(
+        "-r", "--rating",
+        help    = "The new rating for the feeling.",
+        choices = scale_names()
+    )
+    parser.add_argument(
+        "-d", "--description",
+        help = "The new description for the feeling."
+    )
+    args = parser.parse_args( arguments )
+    if args.rating is None and args.description is None:
+        parser.error( "give a new --rating and/or --description" )
+
+    feeling = find_feeling( parser, args.when )
+    record( edited := Feeling(
+        feeling.recorded,
+        feeling.feeling if args.rating is None else scale_from_name( args.rating ),
+        feeling.description if args.description is None else args.description
+    ) )
+    print(
+        f"Edited the feeling recorded at {edited.recorded:%Y-%m-%d %H:%M:%S}; "
+        f"now rated {edited.feeling.name.lower()}" + ( f" '{edited.description}'" if edited.description else "" )
+    )
+
+##############################################################################
+def delete( arguments: list[ str ] ) -> None:
+    """Delete a recorded feeling.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling delete",
+        description = "Delete a recorded feeling."
+    )
+    parser.add_argument( "when", help=WHEN_HELP )
+    args = parser.parse_args( arguments )
+
+    delete_feeling( feeling := find_feeling( parser, args.when ) )
+    print(
+        f"Deleted the feeling recorded at {feeling.recorded:%Y-%m-%d %H:%M:%S}, "
+        f"rated {feeling.feeling.name.lower()}" + ( f" '{feeling.description}'" if feeling.description else "" )
+    )
+
+##############################################################################
+def fsck( arguments: list[ str ] ) -> None:
+    """Check the feelings store for problems, and optionally fix them.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling fsck",
+        description = "Check the feelings store for corrupt, misplaced or duplicate records."
+    )
+    fixes = parser.add_mutually_exclusive_group()
+    fixes.add_argument(
+        "-r", "--repair",
+        help   = "Move misplaced records, remove identical duplicates and quarantine anything else.",
+        action = "store_true"
+    )
+    fixes.add_argument(
+        "-q", "--quarantine",
+        help   = "Move every problem record into quarantine.",
+        action = "store_true"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        help = "The number of processes to check the store with.",
+        type = int
+    )
+    args = parser.parse_args( arguments )
+
+    # Misplaced records get handled first so that, when repairing, any
+    # duplicates are compared with the copy in its rightful place.
+    issues = sorted( check( args.jobs ), key=lambda issue: issue.problem is not Problem.MISPLACED )
+    for issue in issues:
+        print( f"{issue.record}: {issue.problem.value}: {issue.detail}" )
+        if args.repair:
+            print( f"  -> {repaired}" if ( repaired := repair( issue ) ) else "  -> removed" )
+        elif args.quarantine:
+            print( f"  -> {quarantine( issue )}" )
+    print( f"{len( issues )} problem(s) found" )
+    if issues and ( args.repair or args.quarantine ):
+        daemon.reload()
+
+##############################################################################
+def sync( arguments: list[ str ] ) -> None:
+    """Synchronise the feelings store with another store.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling sync",
+        description = "Merge the feelings store with another feelings store, in both directions."
+    )
+    parser.add_argument(
+        "other",
+        help = "The directory of the other feelings store.",
+        type = Path
+    )
+    parser.add_argument(
+        "-p", "--prefer",
+        help    = "Which copy of a feeling to keep if it differs between the stores.",
+        choices = [ prefer.value for prefer in Prefer ],
+        default = Prefer.NEITHER.value
+    )
+    parser.add_argument(
+        "--rehash",
+        help   = "Throw away the manifests of both stores and rebuild them before comparing.",
+        action = "store_true"
+    )
+    args = parser.parse_args( arguments )
+    if not args.other.is_dir():
+        parser.error( f"{args.other} is not a directory" )
+    if args.rehash:
+        forget( feelings_home() )
+        forget( args.other )
+    report = sync_stores( feelings_home(), args.other, Prefer( args.prefer ) )
+    if report.pulled:
+        daemon.reload()
+    for conflict in report.conflicts:
+        print( f"Conflict: {conflict.key} differs between {conflict.here} and {conflict.there}" )
+    print(
+        f"Pulled {len( report.pulled )} and pushed {len( report.pushed )} item(s); "
+        f"{len( report.conflicts )} conflict(s)"
+    )
+
+##############################################################################
+def stats( arguments: list[ str ] ) -> None:
+    """Show statistics about the recorded feelings.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling stats",
+        description = "Show a summary of recent feelings."
+    )
+    parser.add_argument(
+        "-b", "--brief",
+        help   = "Show a one-line summary, suitable for a prompt or status bar.",
+        action = "store_true"
+    )
+    parser.add_argument(
+        "-l", "--latest",
+        help    = "The number of latest feelings to show.",
+        type    = int,
+        default = 5
+    )
+    parser.add_argument(
+        "--rebuild",
+        help   = "Rebuild the aggregates from the records before reporting.",
+        action = "store_true"
+    )
+    parser.add_argument(
+        "--store",
+        help    = STORE_HELP,
+        metavar = "STORE",
+        type    = Path,
+        action  = "append"
+    )
+    args = parser.parse_args( arguments )
+
+    if args.rebuild or args.store or ( aggregates := daemon.aggregates() ) is None:
+        aggregates = load_aggregates( args.rebuild, with_local( args.store ) )
+    today      = date.today()
+    periods: dict[ tuple[ str, str ], Tally ] = {
+        ( "Today", "day" ):        aggregates.day( today ),
+        ( "This week", "week" ):   aggregates.between( today - timedelta( days=today.weekday() ), today ),
+        ( "This month", "month" ): aggregates.between( today.replace( day=1 ), today ),
+        ( "This year", "year" ):   aggregates.between( today.replace( month=1, day=1 ), today ),
+        ( "All time", "all" ):     aggregates.overall
+    }
+
+    if args.brief:
+        print( " ".join(
+            f"{brief}:{tally.value:.2f}/{tally.count}" for ( _, brief ), tally in periods.items()
+        ) )
+        return
+
+    print( f"{'':10} {'Mean':>6} {'Count':>6}", *( f"{scale.value:>5}" for scale in Scale ) )
+    for ( period, _ ), tally in periods.items():
+        print(
+            f"{period:10} {tally.value:6.2f} {tally.count:6}",
+            *( f"{tally.count_of( scale ):5}" for scale in Scale )
+        )
+    if args.latest > 0 and ( latest := aggregates.latest[ :args.latest ] ):
+        print( "\nLatest:" )
+        for feeling in latest:
+            print(
+                f"{feeling.recorded:%Y-%m-%d %H:%M:%S} {feeling.feeling.name.lower():9}",
+                feeling.description
+            )
+
+##############################################################################
+def streaks( arguments: list[ str ] ) -> None:
+    """Show recording streaks, gaps and runs of low days.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling streaks",
+        description = "Show recording streaks, missed days and runs of low days."
+    )
+    parser.add_argument(
+        "-m", "--minimum",
+        help    = "The minimum number of consecutive low days to report.",
+        type    = int,
+        default = 3
+    )
+    parser.add_argument(
+        "-g", "--gaps",
+        help    = "The number of most recent gaps in recording to show.",
+        type    = int,
+        default = 5
+    )
+    parser.add_argument(
+        "--store",
+        help    = STORE_HELP,
+        metavar = "STORE",
+        type    = Path,
+        action  = "append"
+    )
+    args = parser.parse_args( arguments )
+
+    if args.store or ( aggregates := daemon.aggregates() ) is None:
+        aggregates = load_aggregates( homes=with_local( args.store ) )
+    history = Streaks().update_all( aggregates.days() )
+    print( f"Current streak: {history.current() or 'none'}" )
+    print( f"Longest streak: {history.longest or 'none'}" )
+    if args.gaps > 0 and ( gaps := history.gaps[ -args.gaps: ] ):
+        print( "\nMost recent gaps:" )
+        for gap in reversed( gaps ):
+            print( f"  {gap}" )
+    if low_runs := history.low_runs( args.minimum ):
+        print( f"\nRuns of {args.minimum} or more low days:" )
+        for low_run in reversed( low_runs ):
+            print( f"  {low_run}" )
+
+##############################################################################
+def words( arguments: list[ str ] ) -> None:
+    """Show the words used in descriptions that go with the best and worst feelings.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling words",
+        description = "Show the words used to describe the best and the worst feelings."
+    )
+    parser.add_argument(
+        "period",
+        nargs = "?",
+        help  = "The year (YYYY) or month (YYYY-MM) to report on; the whole history if not given."
+    )
+    parser.add_argument(
+        "-n", "--number",
+        help    = "The number of words to show for the best and for the worst feelings.",
+        type    = int,
+        default = 10
+    )
+    parser.add_argument(
+        "-m", "--minimum",
+        help    = "The minimum number of feelings a word must describe to be reported.",
+        type    = int,
+        default = 3
+    )
+    parser.add_argument(
+        "--rebuild",
+        help   = "Rebuild the word tallies from the records before reporting.",
+        action = "store_true"
+    )
+    parser.add_argument(
+        "--store",
+        help    = STORE_HELP,
+        metavar = "STORE",
+        type    = Path,
+        action  = "append"
+    )
+    args = parser.parse_args( arguments )
+
+    if args.period is not None and not re.fullmatch( r"[0-9]{4}(-(0[1-9]|1[0-2]))?", args.period ):
+        parser.error( f"'{args.period}' isn't a year (YYYY) or a month (YYYY-MM)" )
+    year, _, month = ( args.period or "" ).partition( "-" )
+    ranked = load_keywords( args.rebuild, with_local( args.store ) ).ranked(
+        year or None, month or None, args.minimum
+    )
+    if not ranked:
+        print( f"No word describes {args.minimum} or more feelings in {args.period or 'the history'}" )
+        return
+    # Only words that lean one way or the other go in either list, so a
+    # word that has a neutral mean is in neither.
+    number   = max( args.number, 0 )
+    positive = [ ( term, tally ) for term, tally in ranked if tally.value > 0 ][ :number ]
+    negative = [ ( term, tally ) for term, tally in reversed( ranked ) if tally.value < 0 ][ :number ]
+    if not ( positive or negative ):
+        print( f"No word describes feelings that lean positive or negative in {args.period or 'the history'}" )
+        return
+    print( f"{'Word':20} {'Mean':>6} {'Count':>6}" )
+    for title, ranking in ( ( "Most positive", positive ), ( "Most negative", negative ) ):
+        if ranking:
+            print( f"\n{title} in {args.period or 'the history'}:" )
+            for term, tally in ranking:
+                print( f"{term:20} {tally.value:6.2f} {tally.count:6}" )
+
+##############################################################################
+def serve_daemon( arguments: list[ str ] ) -> None:
+    """Run, stop or check on the feelings daemon.
+
+    Args:
+        arguments: The command line arguments for the command.
+    """
+    parser = ArgumentParser(
+        prog        = "feeling daemon",
+        description = "Run a daemon that holds the feelings in memory, for quicker access."
+    )
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument(
+        "-s", "--stop",
+        help   = "Stop the running daemon.",
+        action = "store_true"
+    )
+    actions.add_argument(
+        "--status",
+        help   = "Report if the daemon is running.",
+        action = "store_true"
+    )
+    args = parser.parse_args( arguments )
+
+    if args.stop:
+        print( "Daemon asked to stop" if daemon.stop() else "The daemon is not running" )
+    elif args.status:
+        print( "The daemon is running" if daemon.running() else "The daemon is not running" )
+    else:
+        # The server side of the daemon pulls in code that nothing else in
+        # the CLI needs, so only import it when we're going to run it.
+        #
+        # pylint:disable=import-outside-toplevel
+        from .daemon.server import serve
+        if not serve():
+            print( "The daemon is already running" )
+
+##############################################################################
+COMMANDS: Final[ dict[ str, Callable[ [ list[ str ] ], None ] ] ] = {
+    "daemon": serve_daemon,
+    "delete": delete,
+    "edit": edit,
+    "fsck": fsck,
+    "stats": stats,
+    "streaks": streaks,
+    "sync": sync,
+    "words": words,
+}
+"""The commands that can be given in place of a rating."""
+
+##############################################################################
+def memory_budget( args: Namespace ) -> int | None:
+    """Get the memory budget for browsing the history.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        The rough number of bytes of records to hold in memory, or `None`
+        if everything should be held.
+    """
+    return None if args.memory is None else args.memory * 1024 * 1024
+
+##############################################################################
+def with_local( stores: list[ Path ] | None ) -> list[ Path ] | None:
+    """Get the homes of the stores to work with, given some extra stores.
+
+    Args:
+        stores: The homes of any stores given on the command line.
+
+    Returns:
+        The homes of the local store and the given stores, or `None` if no
+        stores were given and so only the local store is needed.
+    """
+    return [ feelings_home(), *stores ] if stores else None
+
+##############################################################################
+def store_homes( args: Namespace ) -> list[ Path ] | None:
+    """Get the homes of the stores to browse the history of.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        The homes of the stores, or `None` if just the local store is to be
+        browsed.
+    """
+    return with_local( args.store )
+
+##############################################################################
+def run() -> Namespace | None:
     """Attempt to run the command line interface for the app.
 
     Returns:
-        `True` if the CLI handled things or `False` if we should go into the CHUI.
+        `None` if the CLI handled things, or the parsed command line
+        arguments if we should go into the CHUI.
     """
 
+    # If we've been asked to run a command, run it.
+    if len( sys.argv ) > 1 and sys.argv[ 1 ] in COMMANDS:
+        COMMANDS[ sys.argv[ 1 ] ]( sys.argv[ 2: ] )
+        return None
+
     # Look on the command line.
     args, description = get_args()
 
     # If we got given a rating, add it to the database...
     if args.rating is not None:
         save_feeling( args.rating, " ".join( description ) )
-        return True
+        return None
 
     # The CLI didn't handle things.
-    return False
+    return args
 
 ### cli.py ends here
@@ -0,0 +1,20 @@
+"""Code for running, and talking to, the feeling daemon."""
+
+##############################################################################
+# Import the client code; the server is only needed by the daemon itself.
+from .client import running, record, delete, feelings, for_day, aggregates, reload, stop
+
+##############################################################################
+# Export them.
+__all__ = [
+    "running",
+    "record",
+    "delete",
+    "feelings",
+    "for_day",
+    "aggregates",
+    "reload",
+    "stop"
+]
+
+### __init__.py ends here
@@ -0,0 +1,176 @@
+"""Code for talking to the feeling daemon, if it's running."""
+
+##############################################################################
+# Python imports.
+import socket
+from json    import dumps, loads
+from pathlib import Path
+from typing  import Any, Final, TypeAlias, cast
+
+##############################################################################
+# XDG imports.
+from xdg import xdg_runtime_dir
+
+##############################################################################
+# Local imports.
+from ..data.aggregates import Aggregates, AggregatesDict
+from ..data.feelings   import Feeling, Feelings, FeelingsDict
+from ..data.storage    import feelings_home
+
+##############################################################################
+TIMEOUT: Final = 10.0
+"""How long to wait, in seconds, for the daemon to respond."""
+
+##############################################################################
+Response: TypeAlias = dict[ str, Any ]
+"""The type of a response from the daemon."""
+
+##############################################################################
+def socket_path() -> Path:
+    """Get the path to the socket the daemon listens on.
+
+    Returns:
+        The path to the daemon's socket.
+
+    Note:
+        If there's a runtime directory the socket lives in there, otherwise
+        it lives in the data directory.
+    """
+    return ( xdg_runtime_dir() or feelings_home() ) / "feeling.sock"
+
+##############################################################################
+def request( command: str, **data: Any ) -> Response | None:
+    """Make a request of the daemon.
+
+    Args:
+        command: The command to send to the daemon.
+        data: Any data to send along with the command.
+
+    Returns:
+        The response from the daemon, or `None` if it isn't running.
+    """
+    if ( family := getattr( socket, "AF_UNIX", None ) ) is None:
+        return None
+    try:
+        with socket.socket( family, socket.SOCK_STREAM ) as daemon:
+            daemon.settimeout( TIMEOUT )
+            daemon.connect( str( socket_path() ) )
+            daemon.sendall( dumps( { "command": command, **data } ).encode() + b"\n" )
+            daemon.shutdown( socket.SHUT_WR )
+            response = b""
+            while chunk := daemon.recv( 65536 ):
+                response += chunk
+    except OSError:
+        return None
+    try:
+        return cast( Response, loads( response ) )
+    except ValueError:
+        return None
+
+##############################################################################
+def running() -> bool:
+    """Is the daemon running?
+
+    Returns:
+        `True` if the daemon is running and responding, `False` if not.
+    """
+    return ( response := request( "ping" ) ) is not None and response.get( "ok", False )
+
+##############################################################################
+def record( feeling: Feeling ) -> bool:
+    """Record a feeling via the daemon.
+
+    Args:
+        feeling: The feeling to record.
+
+    Returns:
+        `True` if the daemon recorded the feeling, `False` if it didn't.
+    """
+    response = request( "record", feelings=[ feeling.as_dict ] )
+    return response is not None and response.get( "ok", False )
+
+##############################################################################
+def delete( feeling: Feeling ) -> bool:
+    """Delete a feeling via the daemon.
+
+    Args:
+        feeling: The feeling to delete.
+
+    Returns:
+        `True` if the daemon handled the deletion, `False` if it didn't.
+
+    Note:
+        The daemon only handles the deletion if it's holding the feeling;
+        if it isn't, the feeling should be deleted from the store directly.
+    """
+    response = request( "delete", keys=[ feeling.key ] )
+    return response is not None and response.get( "ok", False )
+
+##############################################################################
+def feelings() -> Feelings | None:
+    """Get all of the feelings held by the daemon.
+
+    Returns:
+        The feelings, or `None` if the daemon isn't running.
+    """
+    if ( response := request( "feelings" ) ) is not None and response.get( "ok", False ):
+        return Feelings().from_dict( cast( FeelingsDict, response[ "feelings" ] ) )
+    return None
+
+##############################################################################
+def for_day( year: str, month: str, day: str ) -> list[ Feeling ] | None:
+    """Get the feelings held by the daemon for a day.
+
+    Args:
+        year: The year of the month of the day.
+        month: The month of the day.
+        day: The day to get the feelings for.
+
+    Returns:
+        The feelings for that day, oldest first, or `None` if the daemon
+        isn't running.
+
+    Note:
+        Unlike the store, this includes any feelings the daemon has yet to
+        save.
+    """
+    if (
+            response := request( "day", year=year, month=month, day=day )
+    ) is not None and response.get( "ok", False ):
+        return [ Feeling.from_dict( feeling ) for feeling in response[ "feelings" ] ]
+    return None
+
+##############################################################################
+def aggregates() -> Aggregates | None:
+    """Get the aggregates held by the daemon.
+
+    Returns:
+        The aggregates, or `None` if the daemon isn't running.
+    """
+    if ( response := request( "aggregates" ) ) is not None and response.get( "ok", False ):
+        return Aggregates().from_dict( cast( AggregatesDict, response[ "aggregates" ] ) )
+    return None
+
+##############################################################################
+def reload() -> bool:
+    """Ask the daemon to reload the store.
+
+    Returns:
+        `True` if the daemon reloaded, `False` if it isn't running.
+
+    Note:
+        This should be called after the store has been changed by anything
+        other than the daemon.
+    """
+    return ( response := request( "reload" ) ) is not None and response.get( "ok", False )
+
+##############################################################################
+def stop() -> bool:
+    """Ask the daemon to stop.
+
+    Returns:
+        `True` if the daemon was asked to stop, `False` if it isn't running.
+    """
+    return ( response := request( "stop" ) ) is not None and response.get( "ok", False )
+
+### client.py ends here
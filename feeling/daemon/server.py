@@ -0,0 +1,268 @@
+"""The feeling daemon, which holds the feelings in memory behind a socket."""
+
+##############################################################################
+# Python imports.
+import asyncio
+import signal
+from json    import dumps, loads
+from pathlib import Path
+from typing  import Any, Final, cast
+
+##############################################################################
+# Local imports.
+from ..data.aggregates import Aggregates
+from ..data.feelings   import Feeling, Feelings, FeelingDict
+from ..data.storage    import delete, load, load_aggregates, save
+from .client           import Response, running, socket_path
+
+##############################################################################
+class Daemon: # pylint:disable=too-many-instance-attributes
+    """Class that serves the feelings over a Unix domain socket."""
+
+    BATCH_DELAY: Final = 1.0
+    """How long, in seconds, to hold on to newly-recorded feelings before saving them."""
+
+    BATCH_SIZE: Final = 100
+    """The number of newly-recorded feelings that will cause a save right away."""
+
+    def __init__( self, path: Path ) -> None:
+        """Initialise the daemon.
+
+        Args:
+            path: The path to the socket to listen on.
+        """
+        self._path       = path
+        self._feelings   = Feelings()
+        self._aggregates = Aggregates()
+        self._pending: dict[ str, tuple[ Feeling, bool ] ] = {}
+        self._flusher: asyncio.TimerHandle | None = None
+        self._flushes: set[ asyncio.Task[ None ] ] = set()
+        self._flushing   = asyncio.Lock()
+        self._stopping   = asyncio.Event()
+
+    def _reload( self ) -> None:
+        """Reload the feelings from the store."""
+        self._feelings   = load( tolerant=True )
+        self._aggregates = load_aggregates()
+
+    async def _save_pending( self ) -> None:
+        """Save any pending changes to the store.
+
+        Note:
+            This should only be called while holding the flushing lock, so
+            that no two saves of the store ever overlap.
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        pending, self._pending = self._pending, {}
+        batch    = Feelings()
+        deleting = []
+        for feeling, deleted in pending.values():
+            if deleted:
+                deleting.append( feeling )
+            else:
+                batch.add( feeling )
+        if batch.years():
+            await asyncio.to_thread( save, batch )
+        for feeling in deleting:
+            await asyncio.to_thread( delete, feeling )
+
+    async def _flush( self ) -> None:
+        """Save any pending changes to the store, once any save in progress is done."""
+        async with self._flushing:
+            await self._save_pending()
+
+    def _start_flush( self ) -> None:
+        """Start saving the pending changes in the background."""
+        self._flushes.add( flush := asyncio.create_task( self._flush() ) )
+        flush.add_done_callback( self._flushes.discard )
+
+    def _schedule_flush( self ) -> None:
+        """Make sure the pending changes will get saved."""
+        if len( self._pending ) >= self.BATCH_SIZE:
+            self._start_flush()
+        elif self._flusher is None:
+            self._flusher = asyncio.get_running_loop().call_later( self.BATCH_DELAY, self._start_flush )
+
+    async def command_ping( self, _: dict[ str, Any ] ) -> Response:
+        """Respond to a ping.
+
+        Returns:
+            A response saying all is well.
+        """
+        return { "ok": True }
+
+    async def command_record( self, message: dict[ str, Any ] ) -> Response:
+        """Record some feelings.
+
+        Args:
+            message: The message holding the feelings to record.
+
+        Returns:
+            A response saying the feelings were recorded.
+
+        Note:
+            The feelings are available right away, but are saved to the
+            store in batches. A feeling with the same key as one that's
+            already held replaces it.
+        """
+        for data in cast( list[ FeelingDict ], message.get( "feelings", [] ) ):
+            feeling = Feeling.from_dict( data )
+            if ( replaced := self._feelings.get( feeling.key ) ) is not None:
+                self._aggregates.remove( replaced )
+            self._feelings.add( feeling )
+            self._aggregates.add( feeling )
+            self._pending[ feeling.key ] = ( feeling, False )
+        self._schedule_flush()
+        return { "ok": True }
+
+    async def command_delete( self, message: dict[ str, Any ] ) -> Response:
+        """Delete some feelings.
+
+        Args:
+            message: The message holding the keys of the feelings to delete.
+
+        Returns:
+            A response holding the keys of the feelings that were deleted,
+            and those of any that weren't held. The response is only OK if
+            all of them were held.
+
+        Note:
+            The feelings are gone right away, but are deleted from the store
+            in batches.
+        """
+        deleted: list[ str ] = []
+        missing: list[ str ] = []
+        for key in cast( list[ str ], message.get( "keys", [] ) ):
+            if key in self._feelings:
+                self._aggregates.remove( feeling := self._feelings.remove( key ) )
+                self._pending[ key ] = ( feeling, True )
+                deleted.append( key )
+            else:
+                missing.append( key )
+        self._aggregates.restock( self._feelings.newest_first() )
+        self._schedule_flush()
+        if missing:
+            return {
+                "ok": False,
+                "error": f"Not found: {', '.join( missing )}",
+                "deleted": deleted,
+                "missing": missing
+            }
+        return { "ok": True, "deleted": deleted }
+
+    async def command_feelings( self, _: dict[ str, Any ] ) -> Response:
+        """Get all of the feelings.
+
+        Returns:
+            A response holding all of the feelings.
+        """
+        return { "ok": True, "feelings": self._feelings.as_dict }
+
+    async def command_day( self, message: dict[ str, Any ] ) -> Response:
+        """Get the feelings for a day.
+
+        Args:
+            message: The message holding the year, month and day keys of the day.
+
+        Returns:
+            A response holding the feelings recorded on that day, oldest first.
+        """
+        year, month, day = ( str( message.get( period ) ) for period in ( "year", "month", "day" ) )
+        if (
+                year in self._feelings.years() and
+                month in self._feelings.months( year ) and
+                day in self._feelings.days( year, month )
+        ):
+            recorded = sorted( self._feelings.for_day( year, month, day ), key=lambda feeling: feeling.recorded )
+        else:
+            recorded = []
+        return { "ok": True, "feelings": [ feeling.as_dict for feeling in recorded ] }
+
+    async def command_aggregates( self, _: dict[ str, Any ] ) -> Response:
+        """Get the aggregates.
+
+        Returns:
+            A response holding the aggregates.
+        """
+        return { "ok": True, "aggregates": self._aggregates.as_dict }
+
+    async def command_reload( self, _: dict[ str, Any ] ) -> Response:
+        """Reload the feelings from the store.
+
+        Returns:
+            A response saying the feelings were reloaded.
+        """
+        async with self._flushing:
+            await self._save_pending()
+            await asyncio.to_thread( self._reload )
+        return { "ok": True }
+
+    async def command_stop( self, _: dict[ str, Any ] ) -> Response:
+        """Stop the daemon.
+
+        Returns:
+            A response saying the daemon will stop.
+        """
+        self._stopping.set()
+        return { "ok": True }
+
+    async def _respond( self, message: dict[ str, Any ] ) -> Response:
+        """Work out the response to a message.
+
+        Args:
+            message: The message sent to the daemon.
+
+        Returns:
+            The response to send back.
+        """
+        if callable( handler := getattr( self, f"command_{message.get( 'command' )}", None ) ):
+            return cast( Response, await handler( message ) )
+        return { "ok": False, "error": f"Unknown command: {message.get( 'command' )}" }
+
+    async def _serve( self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter ) -> None:
+        """Serve a single request.
+
+        Args:
+            reader: The stream to read the request from.
+            writer: The stream to write the response to.
+        """
+        try:
+            response = await self._respond( cast( dict[ str, Any ], loads( await reader.readline() ) ) )
+        except ( ValueError, KeyError, TypeError, AttributeError ) as error:
+            response = { "ok": False, "error": str( error ) }
+        writer.write( dumps( response ).encode() + b"\n" )
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    async def run( self ) -> None:
+        """Run the daemon until it's asked to stop."""
+        await asyncio.to_thread( self._reload )
+        loop = asyncio.get_running_loop()
+        for stop_signal in ( signal.SIGINT, signal.SIGTERM ):
+            loop.add_signal_handler( stop_signal, self._stopping.set )
+        self._path.unlink( missing_ok=True )
+        server = await asyncio.start_unix_server( self._serve, path=str( self._path ), limit=2**24 )
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            await asyncio.gather( *self._flushes )
+            await self._flush()
+            self._path.unlink( missing_ok=True )
+
+##############################################################################
+def serve() -> bool:
+    """Run the daemon.
+
+    Returns:
+        `True` if the daemon ran, `False` if it was already running.
+    """
+    if running():
+        return False
+    asyncio.run( Daemon( socket_path() ).run() )
+    return True
+
+### server.py ends here
@@ -2,19 +2,28 @@
 
 ##############################################################################
 # Import public code.
-from .feelings import Feeling, Feelings, Scale, scale_names, scale_from_name
-from .storage  import save, load
+from .feelings import Feeling, Feelings
+from .pyramid  import Pyramid, Resolution
+from .scale    import Scale, Tally, scale_names, scale_from_name
+from .storage  import save, load, feeling_files, load_feelings, iter_feelings, merge_feelings
 
 ##############################################################################
 # Export public code.
 __all__ = [
     "Feeling",
     "Feelings",
+    "Pyramid",
+    "Resolution",
     "Scale",
+    "Tally",
     "scale_names",
     "scale_from_name",
     "save",
-    "load"
+    "load",
+    "feeling_files",
+    "load_feelings",
+    "iter_feelings",
+    "merge_feelings"
 ]
 
 ### __init__.py ends here
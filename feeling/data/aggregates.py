@@ -0,0 +1,182 @@
+"""Code for holding a compact index of daily feeling aggregates."""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+from datetime   import date, timedelta
+from typing     import Final, Iterable, Iterator, TypeAlias, cast
+
+##############################################################################
+# Local imports.
+from .feelings import Feeling, FeelingDict
+from .scale    import Tally
+
+##############################################################################
+AggregatesDict: TypeAlias = dict[ str, dict[ str, list[ int ] ] | list[ FeelingDict ] ]
+
+##############################################################################
+class Aggregates:
+    """Class to hold a daily index of feeling tallies.
+
+    This holds just enough information to be able to summarise any run of
+    days, and to show the most recent feelings, without needing to load
+    the whole history.
+    """
+
+    LATEST: Final = 10
+    """The number of most-recent feelings to keep hold of."""
+
+    def __init__( self ) -> None:
+        """Initialise the class."""
+        self._days: dict[ str, Tally ] = {}
+        self._latest: list[ Feeling ] = []
+
+    def add( self, feeling: Feeling ) -> Feeling:
+        """Add a feeling to the aggregates.
+
+        Args:
+            feeling: The feeling to add.
+
+        Returns:
+            The feeling that was added.
+        """
+        self._days.setdefault( feeling.recorded.date().isoformat(), Tally() ).add( feeling.feeling )
+        self._latest = sorted(
+            [ latest for latest in self._latest if latest.key != feeling.key ] + [ feeling ],
+            key=lambda latest: latest.recorded, reverse=True
+        )[ :self.LATEST ]
+        return feeling
+
+    def remove( self, feeling: Feeling ) -> Feeling:
+        """Remove a feeling from the aggregates.
+
+        Args:
+            feeling: The feeling to remove.
+
+        Returns:
+            The feeling that was removed.
+
+        Note:
+            The feeling's scale is removed from its day's tally; if it was
+            one of the latest feelings it will drop out of that list too,
+            with nothing older taking its place until `restock` is called.
+        """
+        if ( day := self._days.get( feeling.recorded.date().isoformat() ) ) is not None:
+            day.remove( feeling.feeling )
+            if not day.count:
+                del self._days[ feeling.recorded.date().isoformat() ]
+        self._latest = [ latest for latest in self._latest if latest.key != feeling.key ]
+        return feeling
+
+    def restock( self, newest_first: Iterable[ Feeling ] ) -> "Aggregates":
+        """Top the latest feelings back up, after some have been removed.
+
+        Args:
+            newest_first: The feelings covered by the aggregates, from the
+                newest to the oldest.
+
+        Returns:
+            self
+
+        Note:
+            The feelings are only read for as long as there's room in the
+            list of the latest feelings, so if it's already full none of
+            them are read at all.
+        """
+        if len( self._latest ) < self.LATEST:
+            held = { latest.key for latest in self._latest }
+            for feeling in newest_first:
+                if feeling.key not in held:
+                    self._latest.append( feeling )
+                    if len( self._latest ) >= self.LATEST:
+                        break
+        return self
+
+    def add_all( self, feelings: Iterable[ Feeling ] ) -> "Aggregates":
+        """Add a collection of feelings to the aggregates.
+
+        Args:
+            feelings: The feelings to add.
+
+        Returns:
+            self
+        """
+        for feeling in feelings:
+            self.add( feeling )
+        return self
+
+    def day( self, day: date ) -> Tally:
+        """Get the tally for a given day.
+
+        Args:
+            day: The day to get the tally for.
+
+        Returns:
+            The tally for that day.
+        """
+        return self._days.get( day.isoformat(), Tally() )
+
+    def between( self, start: date, end: date ) -> Tally:
+        """Get the tally for a run of days.
+
+        Args:
+            start: The first day of the run.
+            end: The last day of the run.
+
+        Returns:
+            The tally for all of the days from `start` to `end`, inclusive.
+        """
+        tally = Tally()
+        for offset in range( ( end - start ).days + 1 ):
+            tally += self.day( start + timedelta( days=offset ) )
+        return tally
+
+    def days( self ) -> Iterator[ tuple[ date, Tally ] ]:
+        """Iterate over the recorded days.
+
+        Yields:
+            Each recorded day and its tally, oldest first.
+        """
+        for day in sorted( self._days ):
+            yield date.fromisoformat( day ), self._days[ day ]
+
+    @property
+    def overall( self ) -> Tally:
+        """The tally for the whole history."""
+        tally = Tally()
+        for day in self._days.values():
+            tally += day
+        return tally
+
+    @property
+    def latest( self ) -> list[ Feeling ]:
+        """The most recently-recorded feelings, newest first."""
+        return list( self._latest )
+
+    @property
+    def as_dict( self ) -> AggregatesDict:
+        """The aggregates as a JSON-friendly dictionary."""
+        return {
+            "days": { day: tally.spread for day, tally in self._days.items() },
+            "latest": [ feeling.as_dict for feeling in self._latest ]
+        }
+
+    def from_dict( self, data: AggregatesDict ) -> "Aggregates":
+        """Reset the aggregates to those given in the dictionary.
+
+        Args:
+            data: A dictionary containing the aggregates data.
+
+        Returns:
+            self
+        """
+        self._days = {
+            day: Tally( list( spread ) )
+            for day, spread in cast( dict[ str, list[ int ] ], data[ "days" ] ).items()
+        }
+        self._latest = [
+            Feeling.from_dict( feeling ) for feeling in cast( list[ FeelingDict ], data[ "latest" ] )
+        ]
+        return self
+
+### aggregates.py ends here
@@ -0,0 +1,185 @@
+"""Code for checking, and optionally repairing, the feeling data store."""
+
+##############################################################################
+# Python imports.
+from concurrent         import futures
+from collections        import defaultdict
+from dataclasses        import dataclass
+from enum               import Enum
+from pathlib            import Path
+from typing             import Final
+
+##############################################################################
+# Local imports.
+from .feelings import Feeling
+from .manifest import invalidate
+from .storage  import (
+    feelings_home, feeling_files, load_feeling, record_path, forget_aggregates, forget_keywords, BAD_RECORD
+)
+
+##############################################################################
+class Problem( Enum ):
+    """The kinds of problem that can be found in the store."""
+
+    CORRUPT = "corrupt"
+    """The record can't be loaded."""
+
+    MISPLACED = "misplaced"
+    """The record doesn't live where its content says it should."""
+
+    DUPLICATE = "duplicate"
+    """The record is a second copy of a feeling held elsewhere."""
+
+##############################################################################
+@dataclass( frozen=True )
+class Issue:
+    """Details of an issue found with a record in the store."""
+
+    record: Path
+    """The path to the record with the issue."""
+
+    problem: Problem
+    """The problem with the record."""
+
+    detail: str
+    """A description of the problem."""
+
+    feeling: Feeling | None = None
+    """The feeling held in the record, if it could be loaded."""
+
+##############################################################################
+@dataclass( frozen=True )
+class _Scanned:
+    """The result of scanning an individual record."""
+
+    record: Path
+    """The path to the record that was scanned."""
+
+    feeling: Feeling | None = None
+    """The feeling in the record, or `None` if it couldn't be loaded or is a tombstone."""
+
+    error: str = ""
+    """The reason the record couldn't be loaded, if it couldn't."""
+
+##############################################################################
+def _scan( record: Path ) -> _Scanned:
+    """Scan an individual record.
+
+    Args:
+        record: The path to the record to scan.
+
+    Returns:
+        The result of the scan.
+    """
+    try:
+        return _Scanned( record, load_feeling( record ) )
+    except BAD_RECORD as error:
+        return _Scanned( record, error=f"{error.__class__.__name__}: {error}" )
+
+##############################################################################
+SCAN_CHUNK_SIZE: Final = 256
+"""The number of records to hand to each scanning process at a time."""
+
+##############################################################################
+def check( workers: int | None=None ) -> list[ Issue ]:
+    """Check the store for problems.
+
+    Args:
+        workers: The number of processes to scan with, or `None` for the default.
+
+    Returns:
+        The issues found in the store.
+
+    Note:
+        The records are loaded and checked in parallel, across a pool of
+        processes. The tombstones of deleted feelings aren't checked.
+    """
+    issues: list[ Issue ] = []
+    by_key: defaultdict[ str, list[ tuple[ Path, Feeling ] ] ] = defaultdict( list )
+    with futures.ProcessPoolExecutor( max_workers=workers ) as pool:
+        for scanned in pool.map( _scan, feeling_files(), chunksize=SCAN_CHUNK_SIZE ):
+            if scanned.error:
+                issues.append( Issue( scanned.record, Problem.CORRUPT, scanned.error ) )
+            elif scanned.feeling is not None:
+                by_key[ scanned.feeling.key ].append( ( scanned.record, scanned.feeling ) )
+    for key, copies in by_key.items():
+        expected = record_path( copies[ 0 ][ 1 ] )
+        # Keep the copy that's where it should be, if there is one;
+        # otherwise the first one we found.
+        copies = (
+            [ copy for copy in copies if copy[ 0 ] == expected ] +
+            [ copy for copy in copies if copy[ 0 ] != expected ]
+        )
+        record, feeling = copies[ 0 ]
+        if record != expected:
+            issues.append( Issue(
+                record, Problem.MISPLACED, f"{key} should be held in {expected}", feeling
+            ) )
+        for record, feeling in copies[ 1: ]:
+            issues.append( Issue(
+                record, Problem.DUPLICATE, f"{key} is also held in {copies[ 0 ][ 0 ]}", feeling
+            ) )
+    return sorted( issues, key=lambda issue: issue.record )
+
+##############################################################################
+def quarantine_home() -> Path:
+    """Get the path to the directory where problem records are quarantined.
+
+    Returns:
+        The path to the quarantine directory.
+    """
+    return feelings_home() / "quarantine"
+
+##############################################################################
+def quarantine( issue: Issue ) -> Path:
+    """Move the record with an issue into quarantine.
+
+    Args:
+        issue: The issue to quarantine the record for.
+
+    Returns:
+        The path to the quarantined record.
+    """
+    target = quarantine_home() / issue.record.relative_to( feelings_home() )
+    target.parent.mkdir( parents=True, exist_ok=True )
+    invalidate( feelings_home(), issue.record )
+    forget_aggregates()
+    forget_keywords()
+    return issue.record.rename( target )
+
+##############################################################################
+def repair( issue: Issue ) -> Path | None:
+    """Attempt to repair an issue.
+
+    Args:
+        issue: The issue to repair.
+
+    Returns:
+        The path the record now lives at, or `None` if it was removed.
+
+    Note:
+        Misplaced records are moved to where they should be, and
+        duplicates that are identical to the copy being kept are removed.
+        Anything else that can't be safely fixed is quarantined.
+    """
+    if issue.problem is Problem.MISPLACED and issue.feeling is not None:
+        if not ( target := record_path( issue.feeling ) ).exists():
+            target.parent.mkdir( parents=True, exist_ok=True )
+            invalidate( feelings_home(), issue.record )
+            invalidate( feelings_home(), target )
+            forget_aggregates()
+            forget_keywords()
+            return issue.record.rename( target )
+    elif issue.problem is Problem.DUPLICATE and issue.feeling is not None:
+        try:
+            if load_feeling( record_path( issue.feeling ) ) == issue.feeling:
+                invalidate( feelings_home(), issue.record )
+                forget_aggregates()
+                forget_keywords()
+                issue.record.unlink()
+                return None
+        except BAD_RECORD:
+            pass
+    return quarantine( issue )
+
+### check.py ends here
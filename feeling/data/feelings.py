@@ -3,74 +3,16 @@
 ##############################################################################
 # Python imports.
 from __future__  import annotations
-from typing      import cast, TypeAlias, Iterator, Iterable
-from datetime    import datetime
+from typing      import cast, TypeAlias, Iterable, Iterator
+from datetime    import date, datetime
 from collections import defaultdict
 from dataclasses import dataclass, field
-from enum        import Enum
 
 ##############################################################################
-class Scale( Enum ):
-    """The scale of feelings."""
-
-    VERY_LOW  = -2
-    LOW       = -1
-    NEUTRAL   = 0
-    GOOD      = 1
-    VERY_GOOD = 2
-
-##############################################################################
-SCALE_NAMES = {
-    Scale.VERY_LOW: {
-        str( Scale.VERY_LOW.value ),
-        "rubbish", "worst", "lowest", "horrible"
-    },
-    Scale.LOW: {
-        str( Scale.LOW.value ),
-        "low", "down", "meh", "blah", "downbeat", "negative"
-    },
-    Scale.NEUTRAL: {
-        str( Scale.NEUTRAL.value ),
-        "ok", "okay", "flat", "neutral", "level"
-    },
-    Scale.GOOD: {
-        str( Scale.GOOD.value ),
-        "good", "upbeat", "fine", "better", "positive"
-    },
-    Scale.VERY_GOOD: {
-        str( Scale.VERY_GOOD.value ),
-        "excellent", "great", "amazing", "wonderful", "elated",
-        "fantastic", "awesome"
-    }
-}
-"""Scale to alternate name mappings."""
-
-##############################################################################
-def scale_names() -> set[ str ]:
-    """All of the names that describe the feeling scales.
-
-    Returns:
-        A set of all of the names that describe the feeling scales.
-    """
-    return set.union( *SCALE_NAMES.values() )
-
-##############################################################################
-def scale_from_name( name: str ) -> Scale:
-    """Get a feeling scale from a given name.
-
-    Args:
-        name: The name of a feeling scale.
-
-    Returns:
-        The related feeling scale.
-
-    Raises:
-        TypeError: If the name is not recognised.
-    """
-    for scale, names in SCALE_NAMES.items():
-        if name in names:
-            return scale
-    raise ValueError( f"'{name}' is not a recognised feeling scale name" )
+# Local imports.
+from .pyramid import Pyramid
+from .scale   import Scale, Tally
+from .streaks import Streaks
 
 ##############################################################################
 FeelingDict: TypeAlias = dict[ str, int | str ]
@@ -138,7 +80,7 @@ class Feeling:
 FeelingsDict: TypeAlias = dict[ str, FeelingDict ]
 
 ##############################################################################
-class Feelings:
+class Feelings: # pylint:disable=too-many-public-methods
     """Class to hold the feeling data."""
 
     def __init__( self ) -> None:
@@ -146,14 +88,101 @@ class Feelings:
         self._history: defaultdict[ str, defaultdict[ str, defaultdict[ str, dict[ str, Feeling ] ] ] ] = defaultdict(
             lambda: defaultdict( lambda: defaultdict( dict ) )
         )
+        self._versions: defaultdict[ tuple[ str, ... ], int ] = defaultdict( int )
+        self._tallies: defaultdict[ tuple[ str, ... ], Tally ] = defaultdict( Tally )
+        self._streaks = Streaks()
+        self._pyramid = Pyramid()
+        self._deferred: dict[ str, Feeling ] | None = None
+        self._stale: dict[ tuple[ str, str, str ], date ] | None = None
+
+    def version( self, *period: str ) -> int:
+        """Get the version of the data for a given period.
+
+        Args:
+            period: The year, month and day keys of the period, as far down
+                as required. With no keys the version is for the whole
+                history.
+
+        Returns:
+            A number that changes every time the data for the period changes.
+        """
+        return self._versions[ period ]
+
+    def tally( self, *period: str ) -> Tally:
+        """Get the tally of feelings for a given period.
+
+        Args:
+            period: The year, month and day keys of the period, as far down
+                as required. With no keys the tally is for the whole
+                history.
+
+        Returns:
+            The tally of the feelings recorded in that period.
+        """
+        return self._tallies.get( period, Tally() )
+
+    @staticmethod
+    def _day( key: str ) -> tuple[ str, str, str ]:
+        """Get the keys of the day that a feeling lives in.
+
+        Args:
+            key: The key of the feeling.
+
+        Returns:
+            The year, month and day keys of the feeling.
+
+        Note:
+            The keys are sliced out of the feeling's key, which is needed
+            anyway, rather than being formatted afresh from when it was
+            recorded.
+        """
+        return key[ 0:4 ], key[ 5:7 ], key[ 8:10 ]
+
+    def _touch( self, feeling: Feeling, day: tuple[ str, str, str ], added: bool=True ) -> None:
+        """Account for a feeling being added or removed.
+
+        Args:
+            feeling: The feeling that has been added or removed.
+            day: The year, month and day keys of the feeling.
+            added: `True` if the feeling was added, `False` if it was removed.
+        """
+        for period in ( (), day[ :1 ], day[ :2 ], day ):
+            self._versions[ period ] += 1
+            if added:
+                self._tallies[ period ].add( feeling.feeling )
+            else:
+                self._tallies[ period ].remove( feeling.feeling )
+        if self._deferred is not None:
+            if added:
+                self._deferred[ feeling.key ] = feeling
+            elif self._deferred.pop( feeling.key, None ) is None:
+                self._pyramid.remove( feeling.recorded, feeling.feeling )
+        elif added:
+            self._pyramid.add( feeling.recorded, feeling.feeling )
+        else:
+            self._pyramid.remove( feeling.recorded, feeling.feeling )
+        if self._stale is None:
+            self._streaks.update( feeling.recorded.date(), self.tally( *day ) )
+        elif day not in self._stale:
+            self._stale[ day ] = feeling.recorded.date()
+
+    @property
+    def streaks( self ) -> Streaks:
+        """The recording streaks, gaps and low runs for the feelings."""
+        return self._streaks
+
+    @property
+    def pyramid( self ) -> Pyramid:
+        """The tallies of the feelings at every resolution of time."""
+        return self._pyramid
 
     def years( self ) -> tuple[ str, ... ]:
         """Years where feelings have been recorded.
 
         Returns:
-            All of the years that have been recorded.
+            All of the years that have been recorded, oldest first.
         """
-        return tuple( self._history.keys() )
+        return tuple( sorted( self._history.keys() ) )
 
     def months( self, year: str ) -> tuple[ str, ... ]:
         """Months in a year where feelings have been recorded.
@@ -162,9 +191,9 @@ class Feelings:
             year: The year to get the recorded months for.
 
         Returns:
-            The months recorded for that year.
+            The months recorded for that year, oldest first.
         """
-        return tuple( self._history[ year ].keys() )
+        return tuple( sorted( self._history[ year ].keys() ) )
 
     def days( self, year: str, month: str ) -> tuple[ str, ... ]:
         """Days in a month in a year where feelings have been recorded.
@@ -174,9 +203,9 @@ class Feelings:
             month: The month to get the record days for.
 
         Returns:
-            The recorded days for that month in that year.
+            The recorded days for that month in that year, oldest first.
         """
-        return tuple( self._history[ year ][ month ].keys() )
+        return tuple( sorted( self._history[ year ][ month ].keys() ) )
 
     def for_day( self, year: str, month: str, day: str ) -> Iterator[ Feeling ]:
         """The feelings for a given day.
@@ -217,24 +246,6 @@ class Feelings:
             for day in self.days( year, month ):
                 yield from self.for_day( year, month, day )
 
-    def _overall_value( self, feelings: Iterable[ Feeling ] ) -> float:
-        """Calculate the overall feeling value for a collection of feelings.
-
-        Returns:
-           The overall value of feeling for all of the given feelings.
-        """
-        if ( values := [ feeling.feeling.value for feeling in feelings ] ):
-            return sum( values ) / len( values )
-        return 0.0
-
-    def _overall_scale( self, feelings: Iterable[ Feeling ] ) -> Scale:
-        """Calculate the overall feeling scale for a collection of feelings.
-
-        Returns:
-           The overall scale of feeling for all of the given feelings.
-        """
-        return Scale( round( self._overall_value( feelings ) ) )
-
     def year_scale( self, year: str ) -> Scale:
         """Get the overall feeling scale for a given year.
 
@@ -248,7 +259,7 @@ class Feelings:
             If nothing is recorded for that year, the return value will be
             for a neutral scale.
         """
-        return self._overall_scale( self.for_year( year ) )
+        return self.tally( year ).scale
 
     def year_value( self, year: str ) -> float:
         """Get the overall feeling value for a given year.
@@ -263,7 +274,7 @@ class Feelings:
             If nothing is recorded for that year, the return value will be
             for a neutral value.
         """
-        return self._overall_value( self.for_year( year ) )
+        return self.tally( year ).value
 
     def month_scale( self, year: str, month: str ) -> Scale:
         """Get the overall feeling scale for a given month.
@@ -279,7 +290,7 @@ class Feelings:
             If nothing is recorded for that month, the return value will be
             for a neutral scale.
         """
-        return self._overall_scale( self.for_month( year, month ) )
+        return self.tally( year, month ).scale
 
     def month_value( self, year: str, month: str ) -> float:
         """Get the overall feeling value for a given month.
@@ -295,7 +306,7 @@ class Feelings:
             If nothing is recorded for that month, the return value will be
             for a neutral value.
         """
-        return self._overall_value( self.for_month( year, month ) )
+        return self.tally( year, month ).value
 
     def day_scale( self, year: str, month: str, day: str ) -> Scale:
         """Get the overall feeling scale for a given day.
@@ -312,7 +323,7 @@ class Feelings:
             If nothing is recorded for that day, the return value will be
             for a neutral scale.
         """
-        return self._overall_scale( self.for_day( year, month, day ) )
+        return self.tally( year, month, day ).scale
 
     def day_value( self, year: str, month: str, day: str ) -> float:
         """Get the overall feeling value for a given day.
@@ -329,7 +340,7 @@ class Feelings:
             If nothing is recorded for that day, the return value will be
             for a neutral value.
         """
-        return self._overall_value( self.for_day( year, month, day ) )
+        return self.tally( year, month, day ).value
 
     def add( self, feeling: Feeling ) -> Feeling:
         """Add a feeling.
@@ -340,7 +351,69 @@ class Feelings:
         Returns:
             The newly-added feeling entry.
         """
-        self._history[ feeling.year_key ][ feeling.month_key ][ feeling.day_key ][ feeling.key ] = feeling
+        year, month, day = period = self._day( key := feeling.key )
+        recorded = self._history[ year ][ month ][ day ]
+        if ( replaced := recorded.get( key ) ) is not None:
+            self._touch( replaced, period, added=False )
+        recorded[ key ] = feeling
+        self._touch( feeling, period )
+        return feeling
+
+    def add_all( self, feelings: Iterable[ Feeling ] ) -> "Feelings":
+        """Add a collection of feelings in one go.
+
+        Args:
+            feelings: The feelings to add.
+
+        Returns:
+            self
+
+        Note:
+            The pyramid and the streaks aren't updated as each feeling is
+            added; instead, once they're all in, the feelings are added to
+            the pyramid in one pass and the streaks are updated once for
+            each day that was touched.
+        """
+        self._deferred = {}
+        self._stale    = {}
+        try:
+            for feeling in feelings:
+                self.add( feeling )
+        finally:
+            deferred, self._deferred = self._deferred, None
+            stale, self._stale       = self._stale, None
+            self._pyramid.add_all( ( feeling.recorded, feeling.feeling ) for feeling in deferred.values() )
+            self._streaks.update_all( ( stale[ day ], self.tally( *day ) ) for day in sorted( stale ) )
+        return self
+
+    def remove( self, key: str ) -> Feeling:
+        """Remove a feeling.
+
+        Args:
+            key: The key of the feeling to remove.
+
+        Returns:
+            The feeling that was removed.
+
+        Raises:
+            KeyError: If there is no feeling with that key.
+
+        Note:
+            Any day, month or year that is left with no feelings is removed
+            too, so that it no longer shows as recorded.
+        """
+        if ( feeling := self.get( key ) ) is None:
+            raise KeyError( key )
+        year_key, month, day = period = self._day( key )
+        year = self._history[ year_key ]
+        del year[ month ][ day ][ key ]
+        self._touch( feeling, period, added=False )
+        if not year[ month ][ day ]:
+            del year[ month ][ day ]
+            if not year[ month ]:
+                del year[ month ]
+                if not year:
+                    del self._history[ year_key ]
         return feeling
 
     def record( self,
@@ -370,12 +443,23 @@ class Feelings:
         """Allow iterating through all the recorded feelings.
 
         Yields:
-            Each feeling record.
+            Each feeling record, ordered by year, month and day.
         """
-        for year in self._history.values():
-            for month in year.values():
-                for day in month.values():
-                    yield from day.values()
+        for year in self.years():
+            yield from self.for_year( year )
+
+    def newest_first( self ) -> Iterator[ Feeling ]:
+        """Iterate through the recorded feelings from the newest to the oldest.
+
+        Yields:
+            Each feeling record, newest first.
+        """
+        for year in reversed( self.years() ):
+            for month in reversed( self.months( year ) ):
+                for day in reversed( self.days( year, month ) ):
+                    yield from sorted(
+                        self.for_day( year, month, day ), key=lambda feeling: feeling.recorded, reverse=True
+                    )
 
     @property
     def as_dict( self ) -> FeelingsDict:
@@ -391,12 +475,45 @@ class Feelings:
         Returns:
             self
         """
-        for value in data.values():
-            feeling = Feeling.from_dict( value )
-            self._history[ feeling.year_key ][ feeling.month_key ][ feeling.day_key ][ feeling.key ] = feeling
-        return self
+        return self.add_all( Feeling.from_dict( value ) for value in data.values() )
+
+    def _recorded( self, year: str, month: str, day: str ) -> dict[ str, Feeling ] | None:
+        """Get the feelings recorded on a day, if the day has been recorded.
+
+        Args:
+            year: The year of the month of the day.
+            month: The month of the day.
+            day: The day to get the feelings for.
+
+        Returns:
+            The feelings for the day, keyed on their keys, or `None` if
+            nothing has been recorded on that day.
+
+        Note:
+            Unlike looking the day up directly, this doesn't leave behind
+            empty entries for days that haven't been recorded.
+        """
+        if year in self._history and month in self._history[ year ] and day in self._history[ year ][ month ]:
+            return self._history[ year ][ month ][ day ]
+        return None
+
+    def get( self, key: str ) -> Feeling | None:
+        """Get a feeling, if it's held.
+
+        Args:
+            key: The key of the feeling to get.
+
+        Returns:
+            The feeling, or `None` if there is no feeling with that key.
+        """
+        return None if ( day := self._recorded( *self._day( key ) ) ) is None else day.get( key )
+
+    def __contains__( self, key: str ) -> bool:
+        return self.get( key ) is not None
 
     def __getitem__( self, key: str ) -> Feeling:
-        return self._history[ key[ 0:4 ] ][ key[ 5:7 ] ][ key[ 8:10 ] ][ key ]
+        if ( feeling := self.get( key ) ) is None:
+            raise KeyError( key )
+        return feeling
 
 ### feelings.py ends here
@@ -0,0 +1,190 @@
+"""Code for holding tallies of the words used to describe feelings."""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+import re
+from typing     import Final, Iterable, TypeAlias
+
+##############################################################################
+# Local imports.
+from .feelings import Feeling
+from .scale    import Tally
+
+##############################################################################
+KeywordsDict: TypeAlias = dict[ str, dict[ str, list[ int ] ] ]
+
+##############################################################################
+WORD: Final = re.compile( r"[^\W\d_]+(?:['’][^\W\d_]+)*" )
+"""The pattern that picks the words out of a description."""
+
+MINIMUM_LENGTH: Final = 3
+"""The shortest a word can be and still be counted as a term."""
+
+STOP_WORDS: Final = frozenset( {
+    "about", "after", "again", "all", "also", "and", "any", "are", "been",
+    "before", "but", "can", "could", "did", "didn't", "don't", "feel",
+    "feeling", "feelings", "felt", "for", "from", "get", "got", "had", "has",
+    "have", "her", "him", "his", "i'm", "i've", "into", "its", "it's",
+    "just", "more", "much", "not", "now", "our", "out", "really", "she",
+    "should", "some", "still", "than", "that", "the", "their", "them",
+    "then", "there", "they", "this", "too", "very", "was", "were", "what",
+    "when", "which", "who", "will", "with", "would", "you", "your"
+} )
+"""Common words that say nothing about why a feeling was how it was."""
+
+##############################################################################
+def terms( description: str ) -> set[ str ]:
+    """Get the terms in a description.
+
+    Args:
+        description: The description to get the terms from.
+
+    Returns:
+        The distinct terms used in the description, in lower case.
+    """
+    return {
+        word for word in WORD.findall( description.lower().replace( "’", "'" ) )
+        if len( word ) >= MINIMUM_LENGTH and word not in STOP_WORDS
+    }
+
+##############################################################################
+class Keywords:
+    """Class to hold, for each term used in descriptions, a tally of the feelings it was used for.
+
+    The tallies are kept for each month, so that the terms for any month,
+    any year or the whole history can be had by adding together the
+    tallies of no more than the months involved, without needing to look
+    at the descriptions themselves.
+    """
+
+    def __init__( self ) -> None:
+        """Initialise the class."""
+        self._months: dict[ str, dict[ str, Tally ] ] = {}
+
+    @staticmethod
+    def _month( feeling: Feeling ) -> str:
+        """Get the key of the month a feeling was recorded in.
+
+        Args:
+            feeling: The feeling to get the month for.
+
+        Returns:
+            The month, as `YYYY-MM`.
+        """
+        return f"{feeling.year_key}-{feeling.month_key}"
+
+    def add( self, feeling: Feeling ) -> Feeling:
+        """Add a feeling to the tallies.
+
+        Args:
+            feeling: The feeling to add.
+
+        Returns:
+            The feeling that was added.
+        """
+        if described := terms( feeling.description ):
+            month = self._months.setdefault( self._month( feeling ), {} )
+            for term in described:
+                month.setdefault( term, Tally() ).add( feeling.feeling )
+        return feeling
+
+    def remove( self, feeling: Feeling ) -> Feeling:
+        """Remove a feeling from the tallies.
+
+        Args:
+            feeling: The feeling to remove.
+
+        Returns:
+            The feeling that was removed.
+        """
+        if ( month := self._months.get( key := self._month( feeling ) ) ) is not None:
+            for term in terms( feeling.description ):
+                if ( tally := month.get( term ) ) is not None:
+                    if not tally.remove( feeling.feeling ).count:
+                        del month[ term ]
+            if not month:
+                del self._months[ key ]
+        return feeling
+
+    def add_all( self, feelings: Iterable[ Feeling ] ) -> "Keywords":
+        """Add a collection of feelings to the tallies.
+
+        Args:
+            feelings: The feelings to add.
+
+        Returns:
+            self
+        """
+        for feeling in feelings:
+            self.add( feeling )
+        return self
+
+    def tallies( self, year: str | None=None, month: str | None=None ) -> dict[ str, Tally ]:
+        """Get the tally for each term used within a period.
+
+        Args:
+            year: The year to get the tallies for, or `None` for the whole
+                history.
+            month: The month, within the year, to get the tallies for, or
+                `None` for the whole year.
+
+        Returns:
+            The tally of the feelings that each term was used for.
+        """
+        period = "" if year is None else year if month is None else f"{year}-{month}"
+        combined: dict[ str, Tally ] = {}
+        for key, terms_for_month in self._months.items():
+            if key.startswith( period ):
+                for term, tally in terms_for_month.items():
+                    combined[ term ] = combined.get( term, Tally() ) + tally
+        return combined
+
+    def ranked( self, year: str | None=None, month: str | None=None, minimum: int=1 ) -> list[ tuple[ str, Tally ] ]:
+        """Get the terms used within a period, from the most positive to the most negative.
+
+        Args:
+            year: The year to rank the terms for, or `None` for the whole
+                history.
+            month: The month, within the year, to rank the terms for, or
+                `None` for the whole year.
+            minimum: The fewest feelings a term must have been used for to
+                be ranked.
+
+        Returns:
+            The terms and their tallies, ordered by the mean of the feelings
+            they were used for, highest first. Terms with the same mean are
+            ordered by how often they were used, most first.
+        """
+        return sorted(
+            (
+                ( term, tally ) for term, tally in self.tallies( year, month ).items()
+                if tally.count >= minimum
+            ),
+            key=lambda ranking: ( -ranking[ 1 ].value, -ranking[ 1 ].count, ranking[ 0 ] )
+        )
+
+    @property
+    def as_dict( self ) -> KeywordsDict:
+        """The tallies as a JSON-friendly dictionary."""
+        return {
+            key: { term: tally.spread for term, tally in month.items() }
+            for key, month in self._months.items()
+        }
+
+    def from_dict( self, data: KeywordsDict ) -> "Keywords":
+        """Reset the tallies to those given in the dictionary.
+
+        Args:
+            data: A dictionary containing the tallies.
+
+        Returns:
+            self
+        """
+        self._months = {
+            key: { term: Tally( list( spread ) ) for term, spread in month.items() }
+            for key, month in data.items()
+        }
+        return self
+
+### keywords.py ends here
@@ -0,0 +1,164 @@
+"""Code that knows how the records of a feeling data store are laid out.
+
+Each day in the store is a directory, within a directory for its month,
+within a directory for its year. Normally the records for a day are held
+directly within the directory for the day; once a day holds more than
+`SHARD_THRESHOLD` records they are moved down into a directory for each
+hour of the day, so that no one directory gets too big to list quickly.
+
+A day with any hour directories is sharded, and any new records for it are
+filed in the directory for their hour.
+"""
+
+##############################################################################
+# Python imports.
+from pathlib import Path
+from typing  import Final
+
+##############################################################################
+YEAR_GLOB: Final = "[0-9][0-9][0-9][0-9]"
+"""The glob pattern for the year directories in the store."""
+
+MONTH_GLOB: Final = "[0-9][0-9]"
+"""The glob pattern for the month directories in a year."""
+
+DAY_GLOB: Final = "[0-9][0-9]"
+"""The glob pattern for the day directories in a month."""
+
+HOUR_GLOB: Final = "[0-9][0-9]"
+"""The glob pattern for the hour directories in a sharded day."""
+
+RECORD_GLOB: Final = "*.json"
+"""The glob pattern for the records."""
+
+HOURS: Final = tuple( f"{hour:02}" for hour in range( 24 ) )
+"""The names of the hour directories a sharded day can have."""
+
+SHARD_THRESHOLD: Final = 500
+"""The number of records a day can hold before it's split into hours."""
+
+##############################################################################
+def record_hour( name: str ) -> str | None:
+    """Get the hour that a record belongs in from its name.
+
+    Args:
+        name: The name of the record.
+
+    Returns:
+        The name of the hour directory for the record, or `None` if the
+        name isn't that of a record.
+
+    Note:
+        Records are named after the time they were recorded, so the name
+        is enough to say where they belong without loading them.
+    """
+    return hour if ( hour := name[ 11:13 ] ) in HOURS else None
+
+##############################################################################
+def is_sharded( day: Path ) -> bool:
+    """Is a day split into hours?
+
+    Args:
+        day: The directory of the day.
+
+    Returns:
+        `True` if the day has been split into hours, `False` if not.
+    """
+    return any( ( day / hour ).is_dir() for hour in HOURS )
+
+##############################################################################
+def flat_records( day: Path ) -> list[ Path ]:
+    """Get the records held directly within a day's directory.
+
+    Args:
+        day: The directory of the day.
+
+    Returns:
+        The paths to the records.
+    """
+    return list( day.glob( RECORD_GLOB ) )
+
+##############################################################################
+def day_records( day: Path ) -> list[ Path ]:
+    """Get all of the records for a day, however they're laid out.
+
+    Args:
+        day: The directory of the day.
+
+    Returns:
+        The paths to the records, sorted oldest first.
+    """
+    return sorted(
+        [ *flat_records( day ), *day.glob( f"{HOUR_GLOB}/{RECORD_GLOB}" ) ],
+        key=lambda record: record.name
+    )
+
+##############################################################################
+def filed_record( day: Path, name: str ) -> Path:
+    """Get the path that a record should be filed at within a day.
+
+    Args:
+        day: The directory of the day.
+        name: The name of the record.
+
+    Returns:
+        The path the record should have, given the layout of the day.
+    """
+    if is_sharded( day ) and ( hour := record_hour( name ) ) is not None:
+        return day / hour / name
+    return day / name
+
+##############################################################################
+def find_record( day: Path, name: str ) -> Path:
+    """Find where a record is held within a day.
+
+    Args:
+        day: The directory of the day.
+        name: The name of the record.
+
+    Returns:
+        The path to the record, or the path it should be filed at if it
+        isn't there.
+    """
+    if ( hour := record_hour( name ) ) is not None and ( record := day / hour / name ).exists():
+        return record
+    if ( record := day / name ).exists():
+        return record
+    return filed_record( day, name )
+
+##############################################################################
+def shard( day: Path ) -> list[ Path ]:
+    """Split a day into hours.
+
+    Args:
+        day: The directory of the day.
+
+    Returns:
+        The new paths of the records that were moved.
+
+    Note:
+        Anything in the day that doesn't look like a record is left where
+        it is; `feeling fsck` will find it.
+    """
+    moved: list[ Path ] = []
+    for record in flat_records( day ):
+        if ( hour := record_hour( record.name ) ) is not None:
+            ( day / hour ).mkdir( exist_ok=True )
+            moved.append( record.rename( day / hour / record.name ) )
+    return moved
+
+##############################################################################
+def shard_if_dense( day: Path ) -> bool:
+    """Split a day into hours if it holds too many records directly.
+
+    Args:
+        day: The directory of the day.
+
+    Returns:
+        `True` if the day was split, `False` if not.
+    """
+    if len( flat_records( day ) ) > SHARD_THRESHOLD:
+        return bool( shard( day ) )
+    return False
+
+### layout.py ends here
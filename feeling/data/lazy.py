@@ -0,0 +1,222 @@
+"""Code for holding feelings where the records are only loaded on demand."""
+
+##############################################################################
+# Python imports.
+from collections import OrderedDict
+from pathlib     import Path
+from typing      import Final, Iterator, Sequence, TypeAlias
+
+##############################################################################
+# Local imports.
+from .aggregates import Aggregates
+from .feelings   import Feeling, Feelings
+from .pyramid    import Pyramid, Resolution
+from .storage    import day_files, feelings_home, iter_feelings, load_aggregates, merge_feelings
+
+##############################################################################
+Day: TypeAlias = tuple[ str, str, str ]
+"""The type of the key of a day."""
+
+##############################################################################
+class LazyFeelings( Feelings ): # pylint:disable=too-many-instance-attributes
+    """Class to hold feeling data, loading the records a day at a time.
+
+    The years, months and days, and the tallies for them, are held all of
+    the time; the records themselves are only loaded when a day is looked
+    at, and are held in a cache of limited size. When the cache is full the
+    least-recently-used days are dropped.
+    """
+
+    RECORD_OVERHEAD: Final = 512
+    """The rough number of bytes of memory a record uses, excluding its description."""
+
+    def __init__( self, budget: int, homes: Sequence[ Path ] | None=None ) -> None:
+        """Initialise the class.
+
+        Args:
+            budget: The rough number of bytes of records to keep in memory.
+            homes: The homes of the stores to load the records from, or
+                `None` for just the local store.
+        """
+        super().__init__()
+        self._pyramid = Pyramid( Resolution.DAY )
+        self._budget  = budget
+        self._homes   = list( homes or [ feelings_home() ] )
+        self._cached: OrderedDict[ Day, int ] = OrderedDict()
+        self._held      = 0
+        self._hits      = 0
+        self._misses    = 0
+        self._evictions = 0
+
+    def index( self, aggregates: Aggregates ) -> "LazyFeelings":
+        """Set up the index of years, months and days from daily aggregates.
+
+        Args:
+            aggregates: The aggregates to build the index from.
+
+        Returns:
+            self
+        """
+        for day, tally in aggregates.days():
+            year_key, month_key, day_key = day.strftime( "%Y %m %d" ).split()
+            self._history[ year_key ][ month_key ][ day_key ] = {}
+            for period in ( (), ( year_key, ), ( year_key, month_key ), ( year_key, month_key, day_key ) ):
+                self._tallies[ period ] = self.tally( *period ) + tally
+            self._streaks.update( day, tally )
+            self._pyramid.add_day( day, tally )
+        return self
+
+    @classmethod
+    def _size( cls, feeling: Feeling ) -> int:
+        """Get the rough size of a feeling record.
+
+        Args:
+            feeling: The feeling to size.
+
+        Returns:
+            The rough number of bytes of memory the feeling uses.
+        """
+        return cls.RECORD_OVERHEAD + len( feeling.description )
+
+    def _evict( self ) -> None:
+        """Drop the least-recently-used days until we're within budget.
+
+        Note:
+            The most-recently-used day is always kept, even if it's over
+            budget by itself.
+        """
+        while self._held > self._budget and len( self._cached ) > 1:
+            ( year, month, day ), size = self._cached.popitem( last=False )
+            self._history[ year ][ month ][ day ] = {}
+            self._held      -= size
+            self._evictions += 1
+
+    def _ensure( self, year: str, month: str, day: str ) -> None:
+        """Ensure that the records for a day are loaded.
+
+        Args:
+            year: The year of the month of the day.
+            month: The month of the day.
+            day: The day to load.
+        """
+        if ( key := ( year, month, day ) ) in self._cached:
+            self._hits += 1
+            self._cached.move_to_end( key )
+            return
+        self._misses += 1
+        records = self._history[ year ][ month ][ day ]
+        for feeling in merge_feelings(
+            iter_feelings( day_files( year, month, day, home ), tolerant=True ) for home in self._homes
+        ):
+            records[ feeling.key ] = feeling
+        self._cached[ key ] = sum( self._size( feeling ) for feeling in records.values() )
+        self._held += self._cached[ key ]
+        self._evict()
+
+    def for_day( self, year: str, month: str, day: str ) -> Iterator[ Feeling ]:
+        """The feelings for a given day.
+
+        Args:
+            year: The year of the month of the day to get the feelings for.
+            month: The month of the day to get the feelings for.
+            day: The day to get the feelings for.
+
+        Yields:
+            The feelings for that day.
+        """
+        self._ensure( year, month, day )
+        yield from list( super().for_day( year, month, day ) )
+
+    def add( self, feeling: Feeling ) -> Feeling:
+        """Add a feeling.
+
+        Args:
+            feeling: The feeling to add.
+
+        Returns:
+            The newly-added feeling entry.
+        """
+        self._ensure( feeling.year_key, feeling.month_key, feeling.day_key )
+        replaced = self._history[ feeling.year_key ][ feeling.month_key ][ feeling.day_key ].get( feeling.key )
+        super().add( feeling )
+        size = self._size( feeling ) - ( 0 if replaced is None else self._size( replaced ) )
+        self._cached[ ( feeling.year_key, feeling.month_key, feeling.day_key ) ] += size
+        self._held += size
+        self._evict()
+        return feeling
+
+    def get( self, key: str ) -> Feeling | None:
+        """Get a feeling, if it's held.
+
+        Args:
+            key: The key of the feeling to get.
+
+        Returns:
+            The feeling, or `None` if there is no feeling with that key.
+        """
+        if self._recorded( year := key[ 0:4 ], month := key[ 5:7 ], day := key[ 8:10 ] ) is not None:
+            self._ensure( year, month, day )
+        return super().get( key )
+
+    def remove( self, key: str ) -> Feeling:
+        """Remove a feeling.
+
+        Args:
+            key: The key of the feeling to remove.
+
+        Returns:
+            The feeling that was removed.
+
+        Raises:
+            KeyError: If there is no feeling with that key.
+        """
+        feeling = super().remove( key )
+        day     = ( feeling.year_key, feeling.month_key, feeling.day_key )
+        if day in self._cached:
+            if self._recorded( *day ) is not None:
+                self._cached[ day ] -= self._size( feeling )
+                self._held          -= self._size( feeling )
+            else:
+                self._held -= self._cached.pop( day )
+        return feeling
+
+    @property
+    def hits( self ) -> int:
+        """The number of times a day was found already loaded."""
+        return self._hits
+
+    @property
+    def misses( self ) -> int:
+        """The number of times a day had to be loaded."""
+        return self._misses
+
+    @property
+    def evictions( self ) -> int:
+        """The number of times a day was dropped to stay within budget."""
+        return self._evictions
+
+    @property
+    def budget( self ) -> int:
+        """The rough number of bytes of records to keep in memory."""
+        return self._budget
+
+    @property
+    def held( self ) -> int:
+        """The rough number of bytes of records currently held."""
+        return self._held
+
+##############################################################################
+def load_lazy( budget: int, homes: Sequence[ Path ] | None=None ) -> LazyFeelings:
+    """Load the feelings such that records are only loaded when needed.
+
+    Args:
+        budget: The rough number of bytes of records to keep in memory.
+        homes: The homes of the stores to load from, or `None` for just the
+            local store.
+
+    Returns:
+        A `LazyFeelings` instance.
+    """
+    return LazyFeelings( budget, homes ).index( load_aggregates( homes=homes ) )
+
+### lazy.py ends here
@@ -0,0 +1,113 @@
+"""Code for maintaining content-hash manifests of a feeling data store.
+
+Every level of the store (the store itself, each year, each month and each
+day) can have a manifest that maps the names of its children to a hash of
+their content. The hash of a year, month or day is the hash of its own
+manifest, so two stores can be compared from the top down, only looking
+inside the parts that differ.
+
+A day's manifest is keyed on the names of its records alone, whether or not
+the day has been split into hours, so the layout of a day doesn't change its
+hash.
+"""
+
+##############################################################################
+# Python imports.
+from hashlib import sha256
+from json    import dumps, loads
+from pathlib import Path
+from typing  import Final, TypeAlias, cast
+
+##############################################################################
+# Local imports.
+from .layout import YEAR_GLOB, MONTH_GLOB, DAY_GLOB, RECORD_GLOB, day_records
+
+##############################################################################
+MANIFEST: Final = ".manifest"
+"""The name of the manifest file within each level of the store."""
+
+##############################################################################
+LEVELS: Final = ( YEAR_GLOB, MONTH_GLOB, DAY_GLOB, RECORD_GLOB )
+"""The glob patterns for the children of each level of the store."""
+
+##############################################################################
+RECORD_DEPTH: Final = len( LEVELS ) - 1
+"""The depth of the store at which the feeling records live."""
+
+##############################################################################
+Manifest: TypeAlias = dict[ str, str ]
+"""The type of a manifest."""
+
+##############################################################################
+def digest( entries: Manifest ) -> str:
+    """Get the content hash for a manifest.
+
+    Args:
+        entries: The manifest to get the hash for.
+
+    Returns:
+        The hash of the manifest.
+    """
+    return sha256( dumps( entries, sort_keys=True ).encode() ).hexdigest()
+
+##############################################################################
+def manifest( directory: Path, depth: int=0 ) -> Manifest:
+    """Get the manifest for a level of the store.
+
+    Args:
+        directory: The directory of the level to get the manifest for.
+        depth: The depth of that level within the store.
+
+    Returns:
+        The manifest for that level.
+
+    Note:
+        If there's no manifest saved for the level it will be worked out,
+        and saved, along with the manifests of any levels below it that
+        needed working out.
+    """
+    try:
+        return cast( Manifest, loads( ( directory / MANIFEST ).read_text() ) )
+    except ( OSError, ValueError ):
+        pass
+    if depth == RECORD_DEPTH:
+        entries = {
+            record.name: sha256( record.read_bytes() ).hexdigest()
+            for record in day_records( directory )
+        }
+    else:
+        entries = {
+            child.name: digest( manifest( child, depth + 1 ) )
+            for child in directory.glob( LEVELS[ depth ] ) if child.is_dir()
+        }
+    if directory.is_dir():
+        ( directory / MANIFEST ).write_text( dumps( entries, sort_keys=True, indent=4 ) )
+    return entries
+
+##############################################################################
+def invalidate( home: Path, record: Path ) -> None:
+    """Invalidate the manifests that cover a record.
+
+    Args:
+        home: The home directory of the store.
+        record: The path to the record that has changed.
+    """
+    level = record.parent
+    while True:
+        ( level / MANIFEST ).unlink( missing_ok=True )
+        if level == home or home not in level.parents:
+            break
+        level = level.parent
+
+##############################################################################
+def forget( home: Path ) -> None:
+    """Remove all of the manifests in a store.
+
+    Args:
+        home: The home directory of the store.
+    """
+    for depth in range( RECORD_DEPTH + 1 ):
+        for level in home.glob( "/".join( [ *LEVELS[ :depth ], MANIFEST ] ) ):
+            level.unlink()
+
+### manifest.py ends here
@@ -0,0 +1,266 @@
+"""Code for holding tallies of feelings at several resolutions of time."""
+
+##############################################################################
+# Python imports.
+from __future__ import annotations
+from datetime   import date, datetime, time, timedelta
+from enum       import Enum
+from typing     import Iterable
+
+##############################################################################
+# Local imports.
+from .scale import Scale, Tally
+
+##############################################################################
+class Resolution( Enum ):
+    """The resolutions at which feelings are tallied, coarsest first."""
+
+    YEAR  = "year"
+    MONTH = "month"
+    WEEK  = "week"
+    DAY   = "day"
+    HOUR  = "hour"
+
+    @property
+    def depth( self ) -> int:
+        """How far down from the coarsest resolution this resolution is."""
+        return list( Resolution ).index( self )
+
+    @property
+    def finer( self ) -> Resolution | None:
+        """The next finer resolution, or `None` if this is the finest."""
+        resolutions = list( Resolution )
+        return resolutions[ self.depth + 1 ] if self.depth + 1 < len( resolutions ) else None
+
+    @property
+    def coarser( self ) -> Resolution | None:
+        """The next coarser resolution, or `None` if this is the coarsest."""
+        return list( Resolution )[ self.depth - 1 ] if self.depth else None
+
+    def bucket( self, moment: datetime ) -> int:
+        """Get the number of the bucket that a moment falls in.
+
+        Args:
+            moment: The moment to get the bucket for.
+
+        Returns:
+            The number of the bucket. Buckets are numbered such that
+            neighbouring periods have neighbouring numbers.
+        """
+        if self is Resolution.YEAR:
+            return moment.year
+        if self is Resolution.MONTH:
+            return ( moment.year * 12 ) + moment.month - 1
+        if self is Resolution.WEEK:
+            # Day one of the ordinal calendar is a Monday, so weeks start
+            # on a Monday.
+            return ( moment.toordinal() - 1 ) // 7
+        if self is Resolution.DAY:
+            return moment.toordinal()
+        return ( moment.toordinal() * 24 ) + moment.hour
+
+    def start( self, bucket: int ) -> datetime:
+        """Get the moment that a bucket starts.
+
+        Args:
+            bucket: The number of the bucket.
+
+        Returns:
+            The moment that the bucket starts.
+        """
+        if self is Resolution.YEAR:
+            return datetime( bucket, 1, 1 )
+        if self is Resolution.MONTH:
+            return datetime( bucket // 12, ( bucket % 12 ) + 1, 1 )
+        if self is Resolution.WEEK:
+            return datetime.combine( date.fromordinal( ( bucket * 7 ) + 1 ), time() )
+        if self is Resolution.DAY:
+            return datetime.combine( date.fromordinal( bucket ), time() )
+        return datetime.combine( date.fromordinal( bucket // 24 ), time( bucket % 24 ) )
+
+    def label( self, bucket: int ) -> str:
+        """Get a label for a bucket.
+
+        Args:
+            bucket: The number of the bucket.
+
+        Returns:
+            A label that describes the period the bucket covers.
+        """
+        return self.start( bucket ).strftime( {
+            Resolution.YEAR: "%Y",
+            Resolution.MONTH: "%Y-%m",
+            Resolution.WEEK: "w/c %Y-%m-%d",
+            Resolution.DAY: "%Y-%m-%d",
+            Resolution.HOUR: "%Y-%m-%d %H:00"
+        }[ self ] )
+
+    def convert( self, bucket: int, resolution: Resolution ) -> int:
+        """Convert a bucket to the bucket at another resolution that it ends in.
+
+        Args:
+            bucket: The number of the bucket.
+            resolution: The resolution to convert to.
+
+        Returns:
+            The number of the bucket, at the other resolution, that holds
+            the end of the given bucket.
+        """
+        return resolution.bucket( self.start( bucket + 1 ) - timedelta( microseconds=1 ) )
+
+##############################################################################
+class Pyramid:
+    """Tallies of feelings at every resolution of time.
+
+    Each resolution has a tally for every period that has a feeling
+    recorded in it, so a view of any length of time, at any resolution,
+    can be had by reading just the buckets that are to be shown.
+    """
+
+    def __init__( self, finest: Resolution=Resolution.HOUR ) -> None:
+        """Initialise the pyramid.
+
+        Args:
+            finest: The finest resolution to keep tallies for.
+        """
+        self._finest      = finest
+        self._resolutions = list( Resolution )[ : finest.depth + 1 ]
+        self._buckets: dict[ Resolution, dict[ int, Tally ] ] = {
+            resolution: {} for resolution in self._resolutions
+        }
+        self._extents: dict[ Resolution, tuple[ int, int ] ] = {}
+
+    @property
+    def finest( self ) -> Resolution:
+        """The finest resolution that tallies are kept for."""
+        return self._finest
+
+    def _tally( self, resolution: Resolution, moment: datetime ) -> Tally:
+        """Get the tally for the bucket a moment falls in, creating it if needed.
+
+        Args:
+            resolution: The resolution to get the tally for.
+            moment: The moment to get the tally for.
+
+        Returns:
+            The tally for the bucket.
+        """
+        bucket = resolution.bucket( moment )
+        if ( tally := self._buckets[ resolution ].get( bucket ) ) is None:
+            tally = self._buckets[ resolution ][ bucket ] = Tally()
+            first, last = self._extents.get( resolution, ( bucket, bucket ) )
+            self._extents[ resolution ] = ( min( first, bucket ), max( last, bucket ) )
+        return tally
+
+    def add( self, recorded: datetime, scale: Scale ) -> None:
+        """Add a feeling to the pyramid.
+
+        Args:
+            recorded: When the feeling was recorded.
+            scale: The scale of the feeling.
+        """
+        for resolution in self._resolutions:
+            self._tally( resolution, recorded ).add( scale )
+
+    def remove( self, recorded: datetime, scale: Scale ) -> None:
+        """Remove a feeling from the pyramid.
+
+        Args:
+            recorded: When the feeling was recorded.
+            scale: The scale of the feeling.
+        """
+        for resolution in self._resolutions:
+            self._tally( resolution, recorded ).remove( scale )
+
+    def _roll_up( self, feelings: Iterable[ tuple[ datetime, Scale ] ] ) -> dict[ Resolution, dict[ int, Tally ] ]:
+        """Tally a collection of feelings at every resolution.
+
+        Args:
+            feelings: When each feeling was recorded, and its scale.
+
+        Returns:
+            The tallies of the feelings, for each resolution.
+
+        Note:
+            Only the finest resolution is tallied from the feelings
+            themselves; each coarser resolution is then rolled up from the
+            tallies of a finer one. Weeks don't fit within months, so months
+            are rolled up from days.
+        """
+        moments = list( feelings )
+        levels: dict[ Resolution, dict[ int, Tally ] ] = {}
+        for resolution in reversed( self._resolutions ):
+            rolled: dict[ int, Tally ] = {}
+            if ( source := Resolution.DAY if resolution is Resolution.MONTH else resolution.finer ) in levels:
+                for bucket, tally in levels[ source ].items():
+                    into = source.convert( bucket, resolution )
+                    rolled[ into ] = rolled[ into ] + tally if into in rolled else tally
+            else:
+                for recorded, scale in moments:
+                    rolled.setdefault( resolution.bucket( recorded ), Tally() ).add( scale )
+            levels[ resolution ] = rolled
+        return levels
+
+    def add_all( self, feelings: Iterable[ tuple[ datetime, Scale ] ] ) -> Pyramid:
+        """Add a collection of feelings to the pyramid in one go.
+
+        Args:
+            feelings: When each feeling was recorded, and its scale.
+
+        Returns:
+            self
+        """
+        for resolution, rolled in self._roll_up( feelings ).items():
+            buckets = self._buckets[ resolution ]
+            for bucket, tally in rolled.items():
+                buckets[ bucket ] = buckets[ bucket ] + tally if bucket in buckets else Tally( list( tally.spread ) )
+            if rolled:
+                low, high   = min( rolled ), max( rolled )
+                first, last = self._extents.get( resolution, ( low, high ) )
+                self._extents[ resolution ] = ( min( first, low ), max( last, high ) )
+        return self
+
+    def add_day( self, day: date, tally: Tally ) -> None:
+        """Add the tally for a whole day to the pyramid.
+
+        Args:
+            day: The day to add the tally for.
+            tally: The tally of the feelings recorded on that day.
+
+        Note:
+            Only resolutions of a day or coarser are updated.
+        """
+        moment = datetime.combine( day, time() )
+        for resolution in self._resolutions[ : Resolution.DAY.depth + 1 ]:
+            self._buckets[ resolution ][ resolution.bucket( moment ) ] = self._tally( resolution, moment ) + tally
+
+    def extent( self, resolution: Resolution ) -> tuple[ int, int ] | None:
+        """Get the range of buckets that have feelings at a given resolution.
+
+        Args:
+            resolution: The resolution to get the range for.
+
+        Returns:
+            The first and last buckets, or `None` if there are none.
+        """
+        return self._extents.get( resolution )
+
+    def window( self, resolution: Resolution, first: int, width: int ) -> list[ Tally | None ]:
+        """Get a run of buckets at a given resolution.
+
+        Args:
+            resolution: The resolution to get the buckets at.
+            first: The number of the first bucket to get.
+            width: The number of buckets to get.
+
+        Returns:
+            The tallies for the buckets, with `None` for any bucket that
+            has nothing recorded in it.
+        """
+        buckets = self._buckets.get( resolution, {} )
+        return [
+            tally if ( tally := buckets.get( bucket ) ) is not None and tally.count else None
+            for bucket in range( first, first + width )
+        ]
+
+### pyramid.py ends here
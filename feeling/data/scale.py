@@ -0,0 +1,164 @@
+"""Defines the scale of feelings, and tallies of feelings on that scale."""
+
+##############################################################################
+# Python imports.
+from __future__  import annotations
+from dataclasses import dataclass, field
+from enum        import Enum
+
+##############################################################################
+class Scale( Enum ):
+    """The scale of feelings."""
+
+    VERY_LOW  = -2
+    LOW       = -1
+    NEUTRAL   = 0
+    GOOD      = 1
+    VERY_GOOD = 2
+
+##############################################################################
+SCALE_NAMES = {
+    Scale.VERY_LOW: {
+        str( Scale.VERY_LOW.value ),
+        "rubbish", "worst", "lowest", "horrible"
+    },
+    Scale.LOW: {
+        str( Scale.LOW.value ),
+        "low", "down", "meh", "blah", "downbeat", "negative"
+    },
+    Scale.NEUTRAL: {
+        str( Scale.NEUTRAL.value ),
+        "ok", "okay", "flat", "neutral", "level"
+    },
+    Scale.GOOD: {
+        str( Scale.GOOD.value ),
+        "good", "upbeat", "fine", "better", "positive"
+    },
+    Scale.VERY_GOOD: {
+        str( Scale.VERY_GOOD.value ),
+        "excellent", "great", "amazing", "wonderful", "elated",
+        "fantastic", "awesome"
+    }
+}
+"""Scale to alternate name mappings."""
+
+##############################################################################
+def scale_names() -> set[ str ]:
+    """All of the names that describe the feeling scales.
+
+    Returns:
+        A set of all of the names that describe the feeling scales.
+    """
+    return set.union( *SCALE_NAMES.values() )
+
+##############################################################################
+def scale_from_name( name: str ) -> Scale:
+    """Get a feeling scale from a given name.
+
+    Args:
+        name: The name of a feeling scale.
+
+    Returns:
+        The related feeling scale.
+
+    Raises:
+        TypeError: If the name is not recognised.
+    """
+    for scale, names in SCALE_NAMES.items():
+        if name in names:
+            return scale
+    raise ValueError( f"'{name}' is not a recognised feeling scale name" )
+
+##############################################################################
+@dataclass
+class Tally:
+    """A running tally of feelings, by scale."""
+
+    spread: list[ int ] = field( default_factory=lambda: [ 0 ] * len( Scale ) )
+    """The number of feelings recorded at each scale, lowest scale first."""
+
+    @staticmethod
+    def _slot( scale: Scale ) -> int:
+        """Get the position in the spread for a given scale.
+
+        Args:
+            scale: The scale to get the position for.
+
+        Returns:
+            The position of that scale within the spread.
+        """
+        return scale.value - Scale.VERY_LOW.value
+
+    def add( self, scale: Scale ) -> "Tally":
+        """Add a feeling of the given scale to the tally.
+
+        Args:
+            scale: The scale of the feeling to add.
+
+        Returns:
+            self
+        """
+        self.spread[ self._slot( scale ) ] += 1
+        return self
+
+    def remove( self, scale: Scale ) -> "Tally":
+        """Remove a feeling of the given scale from the tally.
+
+        Args:
+            scale: The scale of the feeling to remove.
+
+        Returns:
+            self
+        """
+        self.spread[ self._slot( scale ) ] -= 1
+        return self
+
+    def __add__( self, other: "Tally" ) -> "Tally":
+        return Tally( [ mine + theirs for mine, theirs in zip( self.spread, other.spread ) ] )
+
+    def count_of( self, scale: Scale ) -> int:
+        """Get the number of feelings of a given scale in the tally.
+
+        Args:
+            scale: The scale to get the count for.
+
+        Returns:
+            The number of feelings of that scale.
+        """
+        return self.spread[ self._slot( scale ) ]
+
+    @property
+    def count( self ) -> int:
+        """The number of feelings in the tally."""
+        return sum( self.spread )
+
+    @property
+    def total( self ) -> int:
+        """The sum of the values of all the feelings in the tally."""
+        return sum( count * scale.value for scale, count in zip( Scale, self.spread ) )
+
+    @property
+    def value( self ) -> float:
+        """The mean value of the feelings in the tally.
+
+        Note:
+            If there's nothing in the tally this will be a neutral value.
+        """
+        return self.total / count if ( count := self.count ) else 0.0
+
+    @property
+    def scale( self ) -> Scale:
+        """The overall scale of the feelings in the tally."""
+        return Scale( round( self.value ) )
+
+    @property
+    def lowest( self ) -> Scale | None:
+        """The lowest scale of feeling in the tally, or `None` if it's empty."""
+        return next( ( scale for scale, count in zip( Scale, self.spread ) if count ), None )
+
+    @property
+    def highest( self ) -> Scale | None:
+        """The highest scale of feeling in the tally, or `None` if it's empty."""
+        return next( ( scale for scale, count in zip( reversed( Scale ), reversed( self.spread ) ) if count ), None )
+
+### scale.py ends here
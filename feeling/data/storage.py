@@ -2,8 +2,12 @@
 
 ##############################################################################
 # Python imports.
-from pathlib import Path
-from json    import dumps, loads
+from datetime  import datetime
+from heapq     import merge
+from itertools import groupby
+from pathlib   import Path
+from json      import dumps, loads
+from typing    import Final, Iterable, Iterator, Sequence, cast
 
 ##############################################################################
 # XDG imports.
@@ -11,7 +15,14 @@ from xdg import xdg_data_home
 
 ##############################################################################
 # Local imports.
-from .feelings import Feelings, Feeling
+from .aggregates import Aggregates, AggregatesDict
+from .feelings   import Feelings, Feeling
+from .keywords   import Keywords, KeywordsDict
+from .layout     import (
+    YEAR_GLOB, MONTH_GLOB, DAY_GLOB, SHARD_THRESHOLD,
+    day_records, filed_record, flat_records, shard
+)
+from .manifest   import invalidate
 
 ##############################################################################
 def feelings_home() -> Path:
@@ -27,10 +38,62 @@ def feelings_home() -> Path:
     ( home := xdg_data_home() / "feelings" ).mkdir( parents=True, exist_ok=True )
     return home
 
+##############################################################################
+def is_local( home: Path ) -> bool:
+    """Is the given home that of the local store?
+
+    Args:
+        home: The home of the store to check.
+
+    Returns:
+        `True` if it's the home of the local store, `False` if it's the home
+        of some other store.
+    """
+    return home.resolve() == feelings_home().resolve()
+
+##############################################################################
+def day_directory( feeling: Feeling ) -> Path:
+    """Return the path to the directory for the day of a particular feeling.
+
+    Args:
+        feeling: The feeling to get the day directory for.
+
+    Returns:
+        The path to the directory of the day the feeling was recorded on.
+    """
+    return feelings_home() / feeling.year_key / feeling.month_key / feeling.day_key
+
+##############################################################################
+def record_name( feeling: Feeling ) -> str:
+    """Return the name of the file for a particular feeling.
+
+    Args:
+        feeling: The feeling to get the name for.
+
+    Returns:
+        The name of the file that the feeling is held in.
+    """
+    return f"{feeling.key.replace( ':', '-' ).replace( '.', '-' )}.json"
+
+##############################################################################
+def record_path( feeling: Feeling ) -> Path:
+    """Return the path to the file for a particular feeling.
+
+    Args:
+        feeling: The feeling to get the path for.
+
+    Returns:
+        The path to the file where the feeling should be held.
+    """
+    return filed_record( day_directory( feeling ), record_name( feeling ) )
+
 ##############################################################################
 def feeling_record( feeling: Feeling ) -> Path:
     """Return the path to the file for a particular feeling.
 
+    Args:
+        feeling: The feeling to get the path for.
+
     Returns:
         The path to the file where the feeling is held.
 
@@ -38,10 +101,205 @@ def feeling_record( feeling: Feeling ) -> Path:
         As a side-effect, this function will check if the directory that
         holds the file exists and, if it doesn't, it will create it.
     """
-    (
-        day := feelings_home() / feeling.year_key / feeling.month_key / feeling.day_key
-    ).mkdir( parents=True, exist_ok=True )
-    return ( day / feeling.key.replace( ":", "-" ).replace( ".", "-" ) ).with_suffix( ".json" )
+    ( record := record_path( feeling ) ).parent.mkdir( parents=True, exist_ok=True )
+    return record
+
+##############################################################################
+def feeling_files( home: Path | None=None ) -> list[ Path ]:
+    """Get the paths to all of the feeling records in a store.
+
+    Args:
+        home: The home of the store, or `None` for the local store.
+
+    Returns:
+        The paths to the records, sorted oldest first.
+
+    Note:
+        The years, months and days are walked in order, and each day's
+        records are sorted by name, so the order is the same whether or not
+        a day has been split into hours.
+    """
+    home = feelings_home() if home is None else home
+    return [
+        record
+        for year in sorted( home.glob( YEAR_GLOB ) )
+        for month in sorted( year.glob( MONTH_GLOB ) )
+        for day in sorted( month.glob( DAY_GLOB ) )
+        for record in day_records( day )
+    ]
+
+##############################################################################
+def day_files( year: str, month: str, day: str, home: Path | None=None ) -> list[ Path ]:
+    """Get the paths to all of the feeling records for a given day.
+
+    Args:
+        year: The year of the month of the day.
+        month: The month of the day.
+        day: The day to get the records for.
+        home: The home of the store, or `None` for the local store.
+
+    Returns:
+        The paths to the records, sorted oldest first.
+    """
+    return day_records( ( feelings_home() if home is None else home ) / year / month / day )
+
+##############################################################################
+TOMBSTONE: Final = "deleted"
+"""The key, within a record, that marks it as the tombstone of a deleted feeling.
+
+Note:
+    When a feeling is deleted its record is rewritten as a tombstone, rather
+    than being removed, so that the deletion is carried over to other stores
+    by `feeling sync` rather than the feeling being copied back.
+"""
+
+##############################################################################
+def load_feeling( record: Path ) -> Feeling | None:
+    """Load an individual feeling record.
+
+    Args:
+        record: The path to the record to load.
+
+    Returns:
+        The feeling held in that record, or `None` if the record is the
+        tombstone of a deleted feeling.
+    """
+    if TOMBSTONE in ( data := loads( record.read_text() ) ):
+        return None
+    return Feeling.from_dict( data )
+
+##############################################################################
+BAD_RECORD: Final = ( ValueError, KeyError, TypeError, OSError )
+"""The exceptions that can result from trying to load a bad record.
+
+Note:
+    `json.JSONDecodeError` and `UnicodeDecodeError` are both kinds of
+    `ValueError`.
+"""
+
+##############################################################################
+def is_tombstone( record: Path ) -> bool:
+    """Is a record the tombstone of a deleted feeling?
+
+    Args:
+        record: The path to the record to check.
+
+    Returns:
+        `True` if the record is a tombstone, `False` if not.
+    """
+    try:
+        return load_feeling( record ) is None
+    except BAD_RECORD:
+        return False
+
+##############################################################################
+def iter_feelings( records: Iterable[ Path ], tolerant: bool=False ) -> Iterator[ Feeling ]:
+    """Load a collection of feeling records, one at a time.
+
+    Args:
+        records: The paths to the records to load.
+        tolerant: If `True` records that can't be loaded are skipped.
+
+    Yields:
+        The feelings held in those records.
+
+    Raises:
+        ValueError: If a record can't be decoded and we're not tolerant.
+        KeyError: If a record is missing a value and we're not tolerant.
+        TypeError: If a record is the wrong shape and we're not tolerant.
+        OSError: If a record can't be read and we're not tolerant.
+    """
+    for record in records:
+        try:
+            if ( feeling := load_feeling( record ) ) is not None:
+                yield feeling
+        except BAD_RECORD:
+            if not tolerant:
+                raise
+
+##############################################################################
+def load_feelings( records: Iterable[ Path ], tolerant: bool=False ) -> list[ Feeling ]:
+    """Load a collection of feeling records.
+
+    Args:
+        records: The paths to the records to load.
+        tolerant: If `True` records that can't be loaded are skipped.
+
+    Returns:
+        The feelings held in those records.
+
+    Note:
+        See `iter_feelings` for the exceptions that can be raised when not
+        loading tolerantly.
+    """
+    return list( iter_feelings( records, tolerant ) )
+
+##############################################################################
+def merge_feelings( streams: Iterable[ Iterable[ Feeling ] ], newest_first: bool=False ) -> Iterator[ Feeling ]:
+    """Merge several streams of feelings into one, in the order they were recorded.
+
+    Args:
+        streams: The streams of feelings to merge, each in the order they
+            were recorded.
+        newest_first: If `True` the streams, and the result, run from the
+            newest feeling to the oldest.
+
+    Yields:
+        The feelings from all of the streams, in the order they were recorded.
+
+    Note:
+        This is a k-way merge; only the next feeling from each stream is
+        held at any one time, so the streams can be loaded as they're
+        merged. If the same feeling is held in more than one stream it's
+        only yielded once, with the copy from the stream given last
+        winning.
+    """
+    if len( streams := list( streams ) ) == 1:
+        yield from streams[ 0 ]
+    else:
+        for _, copies in groupby(
+            merge( *streams, key=lambda feeling: feeling.recorded, reverse=newest_first ),
+            key=lambda feeling: feeling.key
+        ):
+            *_, feeling = copies
+            yield feeling
+
+##############################################################################
+def stream_feelings( homes: Sequence[ Path ] ) -> Iterator[ Feeling ]:
+    """Stream the feelings of one or more stores, as if they were one store.
+
+    Args:
+        homes: The homes of the stores to stream the feelings of.
+
+    Yields:
+        Each feeling, oldest first. A feeling held in more than one of the
+        stores is only yielded once.
+
+    Note:
+        Any records that can't be loaded are skipped.
+    """
+    yield from merge_feelings( iter_feelings( feeling_files( home ), tolerant=True ) for home in homes )
+
+##############################################################################
+def _unindex( record: Path, indexes: list[ Aggregates | Keywords ] ) -> bool:
+    """Take the feeling held in a record out of indexes, before it's replaced.
+
+    Args:
+        record: The path to the record that's about to be replaced.
+        indexes: The indexes to take the feeling out of.
+
+    Returns:
+        `True` if the indexes are still good, `False` if the record couldn't
+        be loaded and so the indexes can't be kept up to date.
+    """
+    if indexes:
+        try:
+            if ( replaced := load_feeling( record ) ) is not None:
+                for index in indexes:
+                    index.remove( replaced )
+        except BAD_RECORD:
+            return False
+    return True
 
 ##############################################################################
 def save( feelings: Feelings ) -> None:
@@ -49,21 +307,271 @@ def save( feelings: Feelings ) -> None:
 
     Args:
         feelings: The feelings data to save.
+
+    Note:
+        If the store has saved aggregates or keyword tallies they are kept
+        up to date with the saved feelings.
+
+        Any day that ends up holding more than `SHARD_THRESHOLD` records
+        directly is split into hours.
     """
+    aggregates = existing_aggregates()
+    keywords   = existing_keywords()
+    flat: dict[ Path, int ] = {}
     for feeling in feelings:
-        feeling_record( feeling ).write_text( dumps( feeling.as_dict, indent=4 ) )
+        record = feeling_record( feeling )
+        if record.exists():
+            if not _unindex( record, [ index for index in ( aggregates, keywords ) if index is not None ] ):
+                aggregates = keywords = None
+        elif ( day := day_directory( feeling ) ) == record.parent:
+            # This is a new record for a day that isn't split into hours;
+            # if it'll make the day too big, split it.
+            if day not in flat:
+                flat[ day ] = len( flat_records( day ) )
+            flat[ day ] += 1
+            if flat[ day ] > SHARD_THRESHOLD:
+                shard( day )
+                record = feeling_record( feeling )
+        record.write_text( dumps( feeling.as_dict, indent=4 ) )
+        invalidate( feelings_home(), record )
+        for index in ( aggregates, keywords ):
+            if index is not None:
+                index.add( feeling )
+    if aggregates is not None:
+        save_aggregates( aggregates )
+    else:
+        forget_aggregates()
+    if keywords is not None:
+        save_keywords( keywords )
+    else:
+        forget_keywords()
+
+##############################################################################
+def _newest_feelings( aggregates: Aggregates ) -> Iterator[ Feeling ]:
+    """Walk back through the feelings in the local store, from the newest.
+
+    Args:
+        aggregates: The aggregates for the store, used to find the days
+            that have feelings recorded.
+
+    Yields:
+        Each feeling in the store, from the newest to the oldest.
+
+    Note:
+        Each day's records are only loaded once the walk reaches that day.
+    """
+    for day, _ in reversed( list( aggregates.days() ) ):
+        yield from reversed( load_feelings( day_files( f"{day:%Y}", f"{day:%m}", f"{day:%d}" ), tolerant=True ) )
+
+##############################################################################
+def delete( feeling: Feeling ) -> bool:
+    """Delete a feeling from the store.
+
+    Args:
+        feeling: The feeling to delete.
+
+    Returns:
+        `True` if the feeling was deleted, `False` if it wasn't in the store.
+
+    Note:
+        The feeling's record is rewritten, in place, as a tombstone. If the
+        store has saved aggregates or keyword tallies they are kept up to
+        date.
+    """
+    try:
+        if ( deleted := load_feeling( record := record_path( feeling ) ) ) is None:
+            return False
+    except BAD_RECORD:
+        return False
+    record.write_text( dumps( {
+        "recorded": feeling.recorded.isoformat(),
+        TOMBSTONE:  datetime.now().isoformat()
+    }, indent=4 ) )
+    invalidate( feelings_home(), record )
+    if ( aggregates := existing_aggregates() ) is not None:
+        aggregates.remove( deleted )
+        save_aggregates( aggregates.restock( _newest_feelings( aggregates ) ) )
+    if ( keywords := existing_keywords() ) is not None:
+        keywords.remove( deleted )
+        save_keywords( keywords )
+    return True
 
 ##############################################################################
-def load() -> Feelings:
+def load( tolerant: bool=False, homes: Sequence[ Path ] | None=None ) -> Feelings:
     """Load the feelings.
 
+    Args:
+        tolerant: If `True` records that can't be loaded are skipped.
+        homes: The homes of the stores to load from, or `None` for just the
+            local store.
+
     Returns:
         A `Feelings` instance.
+
+    Note:
+        The feelings from all of the stores are merged as they're loaded;
+        if the same feeling is held in more than one store, the copy from
+        the store listed last wins.
+
+        See `iter_feelings` for the exceptions that can be raised when not
+        loading tolerantly.
+    """
+    return Feelings().add_all( merge_feelings(
+        iter_feelings( feeling_files( home ), tolerant ) for home in homes or [ feelings_home() ]
+    ) )
+
+##############################################################################
+AGGREGATES: Final = "aggregates.json"
+"""The name of the file, in the home of a store, that holds its aggregates."""
+
+##############################################################################
+def existing_aggregates( home: Path | None=None ) -> Aggregates | None:
+    """Load the saved aggregates for a store, if there are any.
+
+    Args:
+        home: The home of the store, or `None` for the local store.
+
+    Returns:
+        The saved aggregates, or `None` if there are none to be had.
+    """
+    try:
+        return Aggregates().from_dict( cast(
+            AggregatesDict, loads( ( ( feelings_home() if home is None else home ) / AGGREGATES ).read_text() )
+        ) )
+    except BAD_RECORD:
+        return None
+
+##############################################################################
+def save_aggregates( aggregates: Aggregates, home: Path | None=None ) -> None:
+    """Save the aggregates for a store.
+
+    Args:
+        aggregates: The aggregates to save.
+        home: The home of the store, or `None` for the local store.
+    """
+    ( ( feelings_home() if home is None else home ) / AGGREGATES ).write_text( dumps( aggregates.as_dict ) )
+
+##############################################################################
+def forget_aggregates( home: Path | None=None ) -> None:
+    """Forget the saved aggregates for a store.
+
+    Args:
+        home: The home of the store, or `None` for the local store.
+
+    Note:
+        This should be called whenever the store is changed in a way that
+        doesn't keep the aggregates up to date. They will be rebuilt the
+        next time they're asked for.
+    """
+    ( ( feelings_home() if home is None else home ) / AGGREGATES ).unlink( missing_ok=True )
+
+##############################################################################
+def load_aggregates( rebuild: bool=False, homes: Sequence[ Path ] | None=None ) -> Aggregates:
+    """Load the aggregates for one or more stores, building them if needed.
+
+    Args:
+        rebuild: If `True` the aggregates will be rebuilt from the records.
+        homes: The homes of the stores to load the aggregates of, or `None`
+            for just the local store.
+
+    Returns:
+        The aggregates for the stores.
+
+    Note:
+        Only the local store keeps its aggregates; those of any other store
+        are built each time they're needed, as are those of the local store
+        if it can't be written to. The aggregates for several stores are
+        always built from their merged records, so that a feeling held in
+        more than one of them is only counted once. Building the aggregates
+        streams through the records one at a time, so only the aggregates
+        themselves are ever held in memory.
+    """
+    if homes is not None and len( homes ) > 1:
+        return Aggregates().add_all( stream_feelings( homes ) )
+    home  = homes[ 0 ] if homes else feelings_home()
+    local = is_local( home )
+    if rebuild or not local or ( aggregates := existing_aggregates( home ) ) is None:
+        aggregates = Aggregates().add_all( stream_feelings( [ home ] ) )
+        if local:
+            try:
+                save_aggregates( aggregates, home )
+            except OSError:
+                pass
+    return aggregates
+
+##############################################################################
+KEYWORDS: Final = "keywords.json"
+"""The name of the file, in the home of a store, that holds its keyword tallies."""
+
+##############################################################################
+def existing_keywords( home: Path | None=None ) -> Keywords | None:
+    """Load the saved keyword tallies for a store, if there are any.
+
+    Args:
+        home: The home of the store, or `None` for the local store.
+
+    Returns:
+        The saved keyword tallies, or `None` if there are none to be had.
+    """
+    try:
+        return Keywords().from_dict( cast(
+            KeywordsDict, loads( ( ( feelings_home() if home is None else home ) / KEYWORDS ).read_text() )
+        ) )
+    except ( *BAD_RECORD, AttributeError ):
+        return None
+
+##############################################################################
+def save_keywords( keywords: Keywords, home: Path | None=None ) -> None:
+    """Save the keyword tallies for a store.
+
+    Args:
+        keywords: The keyword tallies to save.
+        home: The home of the store, or `None` for the local store.
+    """
+    ( ( feelings_home() if home is None else home ) / KEYWORDS ).write_text( dumps( keywords.as_dict ) )
+
+##############################################################################
+def forget_keywords( home: Path | None=None ) -> None:
+    """Forget the saved keyword tallies for a store.
+
+    Args:
+        home: The home of the store, or `None` for the local store.
+
+    Note:
+        As with `forget_aggregates`, this should be called whenever the
+        store is changed in a way that doesn't keep the tallies up to date.
+    """
+    ( ( feelings_home() if home is None else home ) / KEYWORDS ).unlink( missing_ok=True )
+
+##############################################################################
+def load_keywords( rebuild: bool=False, homes: Sequence[ Path ] | None=None ) -> Keywords:
+    """Load the keyword tallies for one or more stores, building them if needed.
+
+    Args:
+        rebuild: If `True` the tallies will be rebuilt from the records.
+        homes: The homes of the stores to load the tallies of, or `None` for
+            just the local store.
+
+    Returns:
+        The keyword tallies for the stores.
+
+    Note:
+        As with `load_aggregates`, only the tallies of the local store are
+        kept, and those for several stores are built from their merged
+        records.
     """
-    feelings = Feelings()
-    for feeling in sorted( feelings_home().glob( "[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9]/*.json" ) ):
-        feelings.add( Feeling.from_dict( loads( feeling.read_text() ) ) )
-    return feelings
+    if homes is not None and len( homes ) > 1:
+        return Keywords().add_all( stream_feelings( homes ) )
+    home  = homes[ 0 ] if homes else feelings_home()
+    local = is_local( home )
+    if rebuild or not local or ( keywords := existing_keywords( home ) ) is None:
+        keywords = Keywords().add_all( stream_feelings( [ home ] ) )
+        if local:
+            try:
+                save_keywords( keywords, home )
+            except OSError:
+                pass
+    return keywords
 
 ##############################################################################
 def make_test_data() -> None:
@@ -80,8 +588,8 @@ def make_test_data() -> None:
     #
     # pylint:disable=import-outside-toplevel
     from random    import randint
-    from datetime  import datetime, timedelta
-    from .feelings import Scale
+    from datetime  import timedelta
+    from .scale    import Scale
 
     start      = datetime( 2000, 1, 1, 0, 0, 0, 0 )
     end        = datetime.now()
@@ -0,0 +1,236 @@
+"""Code for tracking recording streaks, gaps and runs of low days."""
+
+##############################################################################
+# Python imports.
+from __future__  import annotations
+from bisect      import bisect_right, insort
+from dataclasses import dataclass
+from datetime    import date, timedelta
+from typing      import Final, Iterable, Iterator
+
+##############################################################################
+# Local imports.
+from .scale import Scale, Tally
+
+##############################################################################
+ONE_DAY: Final = timedelta( days=1 )
+"""The length of a day."""
+
+##############################################################################
+@dataclass( frozen=True )
+class Run:
+    """A run of consecutive days."""
+
+    start: date
+    """The first day of the run."""
+
+    end: date
+    """The last day of the run."""
+
+    @property
+    def length( self ) -> int:
+        """The number of days in the run."""
+        return ( self.end - self.start ).days + 1
+
+    def __str__( self ) -> str:
+        days = f"{self.length} day{'' if self.length == 1 else 's'}"
+        if self.start == self.end:
+            return f"{self.start} ({days})"
+        return f"{self.start} to {self.end} ({days})"
+
+##############################################################################
+class Runs:
+    """Class to hold a set of days as runs of consecutive days.
+
+    Days can be added and removed in any order; the runs are merged and
+    split as needed, so the runs never have to be worked out again from
+    scratch.
+    """
+
+    def __init__( self ) -> None:
+        """Initialise the class."""
+        self._starts: list[ date ] = []
+        self._ends: dict[ date, date ] = {}
+
+    def _run_start( self, day: date ) -> date | None:
+        """Find the start of the run that contains a given day.
+
+        Args:
+            day: The day to look for.
+
+        Returns:
+            The first day of the run holding that day, or `None` if there isn't one.
+        """
+        if ( index := bisect_right( self._starts, day ) - 1 ) >= 0:
+            if self._ends[ start := self._starts[ index ] ] >= day:
+                return start
+        return None
+
+    def _set( self, start: date, end: date ) -> None:
+        """Set a run.
+
+        Args:
+            start: The first day of the run.
+            end: The last day of the run.
+        """
+        if start not in self._ends:
+            insort( self._starts, start )
+        self._ends[ start ] = end
+
+    def _drop( self, start: date ) -> date:
+        """Drop a run.
+
+        Args:
+            start: The first day of the run to drop.
+
+        Returns:
+            The last day of the run that was dropped.
+        """
+        del self._starts[ bisect_right( self._starts, start ) - 1 ]
+        return self._ends.pop( start )
+
+    def __contains__( self, day: object ) -> bool:
+        return isinstance( day, date ) and self._run_start( day ) is not None
+
+    def add( self, day: date ) -> None:
+        """Add a day.
+
+        Args:
+            day: The day to add.
+        """
+        if day in self:
+            return
+        start = day if ( before := self._run_start( day - ONE_DAY ) ) is None else before
+        end   = self._drop( day + ONE_DAY ) if day + ONE_DAY in self._ends else day
+        self._set( start, end )
+
+    def discard( self, day: date ) -> None:
+        """Remove a day, if it's held.
+
+        Args:
+            day: The day to remove.
+        """
+        if ( start := self._run_start( day ) ) is None:
+            return
+        end = self._drop( start )
+        if start < day:
+            self._set( start, day - ONE_DAY )
+        if day < end:
+            self._set( day + ONE_DAY, end )
+
+    def __iter__( self ) -> Iterator[ Run ]:
+        """Iterate over the runs, oldest first.
+
+        Yields:
+            Each of the runs.
+        """
+        for start in self._starts:
+            yield Run( start, self._ends[ start ] )
+
+    def __len__( self ) -> int:
+        return len( self._starts )
+
+    def containing( self, day: date ) -> Run | None:
+        """Get the run that takes in the given day.
+
+        Args:
+            day: The day to look for.
+
+        Returns:
+            The run that holds that day, or `None` if the day isn't held.
+        """
+        if ( start := self._run_start( day ) ) is not None:
+            return Run( start, self._ends[ start ] )
+        return None
+
+##############################################################################
+class Streaks:
+    """Class to track recording streaks, gaps and runs of low days."""
+
+    def __init__( self, low: Scale=Scale.LOW ) -> None:
+        """Initialise the class.
+
+        Args:
+            low: The scale at or below which a day is considered to be low.
+        """
+        self._low_scale = low
+        self._recorded  = Runs()
+        self._low       = Runs()
+
+    def update( self, day: date, tally: Tally ) -> None:
+        """Update the streaks for a change to a day.
+
+        Args:
+            day: The day that has changed.
+            tally: The tally of the feelings for that day, as it now stands.
+        """
+        if tally.count:
+            self._recorded.add( day )
+            if tally.scale.value <= self._low_scale.value:
+                self._low.add( day )
+            else:
+                self._low.discard( day )
+        else:
+            self._recorded.discard( day )
+            self._low.discard( day )
+
+    def update_all( self, days: Iterable[ tuple[ date, Tally ] ] ) -> Streaks:
+        """Update the streaks from a run of days.
+
+        Args:
+            days: The days and their tallies.
+
+        Returns:
+            self
+        """
+        for day, tally in days:
+            self.update( day, tally )
+        return self
+
+    @property
+    def streaks( self ) -> list[ Run ]:
+        """All of the recording streaks, oldest first."""
+        return list( self._recorded )
+
+    @property
+    def longest( self ) -> Run | None:
+        """The longest recording streak, or `None` if nothing is recorded."""
+        return max( self._recorded, key=lambda run: run.length, default=None )
+
+    def current( self, today: date | None=None ) -> Run | None:
+        """Get the current recording streak.
+
+        Args:
+            today: The day to consider as today, or `None` for the actual today.
+
+        Returns:
+            The current streak, or `None` if there isn't one.
+
+        Note:
+            A streak is still current if it ended yesterday, as today's
+            feeling may not have been recorded yet.
+        """
+        today = date.today() if today is None else today
+        return self._recorded.containing( today ) or self._recorded.containing( today - ONE_DAY )
+
+    @property
+    def gaps( self ) -> list[ Run ]:
+        """All of the runs of days missed between recording streaks, oldest first."""
+        runs = list( self._recorded )
+        return [
+            Run( before.end + ONE_DAY, after.start - ONE_DAY )
+            for before, after in zip( runs, runs[ 1: ] )
+        ]
+
+    def low_runs( self, minimum: int=3 ) -> list[ Run ]:
+        """Get the runs of consecutive low days.
+
+        Args:
+            minimum: The minimum number of days a run must have.
+
+        Returns:
+            The runs of low days, oldest first.
+        """
+        return [ run for run in self._low if run.length >= minimum ]
+
+### streaks.py ends here
@@ -0,0 +1,245 @@
+"""Code for synchronising two feeling data stores."""
+
+##############################################################################
+# Python imports.
+from dataclasses import dataclass, field
+from enum        import Enum
+from pathlib     import Path
+from shutil      import copy2, copytree
+
+##############################################################################
+# Local imports.
+from .layout   import filed_record, find_record, shard_if_dense
+from .manifest import MANIFEST, RECORD_DEPTH, manifest
+from .storage  import load_feeling, is_tombstone, forget_aggregates, forget_keywords, BAD_RECORD
+
+##############################################################################
+class Prefer( Enum ):
+    """Which store to prefer when the same feeling differs between them."""
+
+    NEITHER = "neither"
+    """Leave conflicting records alone."""
+
+    HERE = "here"
+    """Prefer the record in the local store."""
+
+    THERE = "there"
+    """Prefer the record in the other store."""
+
+##############################################################################
+@dataclass( frozen=True )
+class Conflict:
+    """Details of a feeling that differs between two stores."""
+
+    key: str
+    """The key of the feeling that differs."""
+
+    here: Path
+    """The path to the record in the local store."""
+
+    there: Path
+    """The path to the record in the other store."""
+
+##############################################################################
+@dataclass
+class SyncReport:
+    """The outcome of synchronising two stores."""
+
+    pulled: list[ Path ] = field( default_factory=list )
+    """The paths in the local store that were copied in from the other store."""
+
+    pushed: list[ Path ] = field( default_factory=list )
+    """The paths in the other store that were copied over from the local store."""
+
+    conflicts: list[ Conflict ] = field( default_factory=list )
+    """The feelings that differ between the two stores."""
+
+##############################################################################
+def _locate( level: Path, name: str, depth: int ) -> Path:
+    """Find a child of a level of a store.
+
+    Args:
+        level: The path of the level.
+        name: The name of the child.
+        depth: The depth of the level within the store.
+
+    Returns:
+        The path to the child.
+
+    Note:
+        The records of a day may or may not be split into hours, so they're
+        looked for in either place.
+    """
+    return find_record( level, name ) if depth == RECORD_DEPTH else level / name
+
+##############################################################################
+def _destination( level: Path, name: str, depth: int ) -> Path:
+    """Get the path a child should be copied to within a level of a store.
+
+    Args:
+        level: The path of the level.
+        name: The name of the child.
+        depth: The depth of the level within the store.
+
+    Returns:
+        The path to copy the child to.
+    """
+    return filed_record( level, name ) if depth == RECORD_DEPTH else level / name
+
+##############################################################################
+def _copy( source: Path, target: Path, depth: int ) -> Path:
+    """Copy a child of a level of one store into another.
+
+    Args:
+        source: The path of the child to copy.
+        target: The path to copy it to.
+        depth: The depth of the level within the store.
+
+    Returns:
+        The path that was copied to.
+
+    Note:
+        Any manifests within the child are copied too; they describe the
+        same content in either store.
+    """
+    target.parent.mkdir( parents=True, exist_ok=True )
+    if depth == RECORD_DEPTH:
+        copy2( source, target )
+    else:
+        copytree( source, target )
+    return target
+
+##############################################################################
+def _conflict_key( here: Path, there: Path ) -> str:
+    """Get the key of the feeling two conflicting records hold.
+
+    Args:
+        here: The record in the local store.
+        there: The record in the other store.
+
+    Returns:
+        The key of the feeling, or the name of the record if neither can be
+        loaded.
+    """
+    for record in ( here, there ):
+        try:
+            if ( feeling := load_feeling( record ) ) is not None:
+                return feeling.key
+        except BAD_RECORD:
+            pass
+    return here.name
+
+##############################################################################
+def _resolve( here: Path, there: Path, prefer: Prefer, report: SyncReport ) -> tuple[ bool, bool ]:
+    """Resolve a conflict between two copies of a record.
+
+    Args:
+        here: The record in the local store.
+        there: The record in the other store.
+        prefer: Which store to prefer.
+        report: The report to add the outcome to.
+
+    Returns:
+        A pair of flags saying if the local and the other store changed.
+
+    Note:
+        A deletion always wins over a feeling that's still held, so a
+        tombstone isn't treated as a conflict.
+    """
+    if is_tombstone( here ):
+        copy2( here, there )
+        report.pushed.append( there )
+        return False, True
+    if is_tombstone( there ):
+        copy2( there, here )
+        report.pulled.append( here )
+        return True, False
+    report.conflicts.append( Conflict( _conflict_key( here, there ), here, there ) )
+    if prefer is Prefer.HERE:
+        copy2( here, there )
+        report.pushed.append( there )
+        return False, True
+    if prefer is Prefer.THERE:
+        copy2( there, here )
+        report.pulled.append( here )
+        return True, False
+    return False, False
+
+##############################################################################
+def _merge( here: Path, there: Path, depth: int, prefer: Prefer, report: SyncReport ) -> tuple[ bool, bool ]:
+    """Merge a level of two stores.
+
+    Args:
+        here: The path of the level in the local store.
+        there: The path of the level in the other store.
+        depth: The depth of the level within the store.
+        prefer: Which store to prefer when records conflict.
+        report: The report to add the outcome to.
+
+    Returns:
+        A pair of flags saying if the local and the other store changed.
+    """
+    mine   = manifest( here, depth )
+    theirs = manifest( there, depth )
+    changed_here = changed_there = False
+    for name in sorted( mine.keys() | theirs.keys() ):
+        if mine.get( name ) == theirs.get( name ):
+            continue
+        if name not in theirs:
+            report.pushed.append( _copy( _locate( here, name, depth ), _destination( there, name, depth ), depth ) )
+            changed_there = True
+        elif name not in mine:
+            report.pulled.append( _copy( _locate( there, name, depth ), _destination( here, name, depth ), depth ) )
+            changed_here = True
+        elif depth < RECORD_DEPTH:
+            child_here, child_there = _merge( here / name, there / name, depth + 1, prefer, report )
+            changed_here  |= child_here
+            changed_there |= child_there
+        else:
+            child_here, child_there = _resolve(
+                _locate( here, name, depth ), _locate( there, name, depth ), prefer, report
+            )
+            changed_here  |= child_here
+            changed_there |= child_there
+    for level, changed in ( ( here, changed_here ), ( there, changed_there ) ):
+        if changed:
+            ( level / MANIFEST ).unlink( missing_ok=True )
+            # Copying records into a day might have made it too big.
+            if depth == RECORD_DEPTH:
+                shard_if_dense( level )
+    return changed_here, changed_there
+
+##############################################################################
+def sync( here: Path, there: Path, prefer: Prefer=Prefer.NEITHER ) -> SyncReport:
+    """Synchronise two feeling stores.
+
+    Args:
+        here: The home directory of the local store.
+        there: The home directory of the other store.
+        prefer: Which store to prefer when records conflict.
+
+    Returns:
+        A report of what was done.
+
+    Note:
+        The stores are compared using the manifests of each year, month and
+        day, so only the parts of the stores that differ are looked at. Once
+        done, both stores will hold every feeling either of them held, with
+        the exception of any conflicting feelings that weren't resolved.
+    """
+    report = SyncReport()
+    changed_here, changed_there = _merge( here, there, 0, prefer, report )
+    # Bring the manifests back up to date on both sides, and drop the
+    # aggregates and keyword tallies of any side that changed so they get
+    # rebuilt.
+    manifest( here )
+    manifest( there )
+    if changed_here:
+        forget_aggregates( here )
+        forget_keywords( here )
+    if changed_there:
+        forget_aggregates( there )
+        forget_keywords( there )
+    return report
+
+### sync.py ends here
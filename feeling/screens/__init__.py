@@ -2,10 +2,12 @@
 
 ##############################################################################
 # Import the screens for the app.
-from .main import Main
+from .confirm import Confirm
+from .edit    import Edit
+from .main    import Main
 
 ##############################################################################
 # Export them.
-__all__ = [ "Main" ]
+__all__ = [ "Confirm", "Edit", "Main" ]
 
 ### __init__.py ends here
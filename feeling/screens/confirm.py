@@ -0,0 +1,99 @@
+"""A screen for confirming an action."""
+
+##############################################################################
+# Python imports.
+from typing import Awaitable, Callable
+
+##############################################################################
+# Textual imports.
+from textual.app        import ComposeResult
+from textual.screen     import Screen
+from textual.containers import Horizontal, Vertical
+from textual.widgets    import Header, Footer, Button, Label
+from textual.binding    import Binding
+
+##############################################################################
+class Confirm( Screen ):
+    """A screen that asks a question before taking an action."""
+
+    BINDINGS = [
+        Binding( "escape,n", "app.pop_screen", "No" ),
+        Binding( "y", "confirm", "Yes" ),
+    ]
+    """The bindings for the confirmation screen."""
+
+    DEFAULT_CSS = """
+    Confirm {
+        align: center middle;
+    }
+
+    Confirm > Vertical {
+        width: 64;
+        height: auto;
+        padding: 1 2 1 2;
+        background: $panel;
+        border: round $error;
+    }
+
+    Confirm Horizontal {
+        height: auto;
+        margin: 1 0 0 0;
+        align: right middle;
+    }
+
+    Confirm Button {
+        margin: 0 0 0 1;
+    }
+    """
+
+    def __init__( self, question: str, action: Callable[ [], Awaitable[ None ] ] ) -> None:
+        """Initialise the screen.
+
+        Args:
+            question: The question to ask.
+            action: The function to call if the answer is yes.
+        """
+        super().__init__()
+        self._question = question
+        self._action   = action
+
+    def compose( self ) -> ComposeResult:
+        """Compose the screen.
+
+        Returns:
+            The composed widgets.
+        """
+        yield Header()
+        with Vertical():
+            yield Label( self._question )
+            with Horizontal():
+                yield Button( "Yes", variant="error", id="yes" )
+                yield Button( "No", id="no" )
+        yield Footer()
+
+    def on_mount( self ) -> None:
+        """Start with the safe answer ready to be picked."""
+        self.query_one( "#no", Button ).focus()
+
+    def action_confirm( self ) -> None:
+        """Leave the screen and take the action.
+
+        Note:
+            The action is left for the app to run once this screen has gone,
+            rather than being run from within this screen's own handlers.
+        """
+        self.app.pop_screen()
+        self.app.call_later( self._action )
+
+    def on_button_pressed( self, event: Button.Pressed ) -> None:
+        """Handle one of the buttons being pressed.
+
+        Args:
+            event: The button press event to handle.
+        """
+        if event.button.id == "yes":
+            self.action_confirm()
+        else:
+            self.app.pop_screen()
+
+### confirm.py ends here
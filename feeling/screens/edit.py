@@ -0,0 +1,127 @@
+"""A screen for editing a feeling."""
+
+##############################################################################
+# Python imports.
+from typing import Awaitable, Callable
+
+##############################################################################
+# Textual imports.
+from textual.app        import ComposeResult
+from textual.screen     import Screen
+from textual.containers import Horizontal, Vertical
+from textual.widgets    import Header, Footer, Button, Input, Label, RadioButton, RadioSet
+from textual.binding    import Binding
+
+##############################################################################
+# Local imports.
+from ..data import Feeling, Scale
+
+##############################################################################
+class Edit( Screen ):
+    """A screen for editing the rating and description of a feeling."""
+
+    BINDINGS = [
+        Binding( "escape", "app.pop_screen", "Cancel" ),
+    ]
+    """The bindings for the edit screen."""
+
+    DEFAULT_CSS = """
+    Edit {
+        align: center middle;
+    }
+
+    Edit > Vertical {
+        width: 64;
+        height: auto;
+        padding: 1 2 1 2;
+        background: $panel;
+        border: round $primary;
+    }
+
+    Edit RadioSet {
+        width: 100%;
+        margin: 1 0 1 0;
+    }
+
+    Edit Horizontal {
+        height: auto;
+        margin: 1 0 0 0;
+        align: right middle;
+    }
+
+    Edit Button {
+        margin: 0 0 0 1;
+    }
+    """
+
+    def __init__( self, feeling: Feeling, done: Callable[ [ Feeling ], Awaitable[ None ] ] ) -> None:
+        """Initialise the screen.
+
+        Args:
+            feeling: The feeling to edit.
+            done: The function to call with the edited feeling, if it's saved.
+        """
+        super().__init__()
+        self._feeling = feeling
+        self._done    = done
+
+    def compose( self ) -> ComposeResult:
+        """Compose the screen.
+
+        Returns:
+            The composed widgets.
+        """
+        yield Header()
+        with Vertical():
+            yield Label( f"The feeling recorded at {self._feeling.recorded:%Y-%m-%d %H:%M:%S}" )
+            yield RadioSet( *(
+                RadioButton( scale.name.replace( "_", " " ).title(), value=scale is self._feeling.feeling )
+                for scale in Scale
+            ) )
+            yield Input( self._feeling.description, placeholder="What's behind the feeling?" )
+            with Horizontal():
+                yield Button( "Save", variant="primary", id="save" )
+                yield Button( "Cancel", id="cancel" )
+        yield Footer()
+
+    def on_mount( self ) -> None:
+        """Start with the description ready to be edited."""
+        self.query_one( Input ).focus()
+
+    @property
+    def edited( self ) -> Feeling:
+        """The feeling as it has been edited."""
+        pressed = self.query_one( RadioSet ).pressed_index
+        return Feeling(
+            self._feeling.recorded,
+            list( Scale )[ pressed ] if pressed >= 0 else self._feeling.feeling,
+            self.query_one( Input ).value.strip()
+        )
+
+    def save( self ) -> None:
+        """Leave the screen, handing on the edited feeling.
+
+        Note:
+            The edited feeling is handed on by the app once this screen has
+            gone, rather than from within this screen's own handlers.
+        """
+        edited = self.edited
+        self.app.pop_screen()
+        self.app.call_later( self._done, edited )
+
+    def on_input_submitted( self ) -> None:
+        """Save the feeling when enter is pressed in the description."""
+        self.save()
+
+    def on_button_pressed( self, event: Button.Pressed ) -> None:
+        """Handle one of the buttons being pressed.
+
+        Args:
+            event: The button press event to handle.
+        """
+        if event.button.id == "save":
+            self.save()
+        else:
+            self.app.pop_screen()
+
+### edit.py ends here
@@ -1,20 +1,37 @@
 """The main screen for the application."""
 
+##############################################################################
+# Python imports.
+from asyncio     import Task, create_task, to_thread
+from collections import OrderedDict
+from functools   import partial
+from itertools   import groupby
+from pathlib     import Path
+from typing      import Final, Iterator, Sequence
+
 ##############################################################################
 # Textual imports.
 from textual.app        import ComposeResult
 from textual.screen     import Screen
 from textual.containers import Horizontal
-from textual.widgets    import Header, Footer, ListView, ListItem, Label
+from textual.widgets    import Header, Footer, ListView, ListItem, Label, ContentSwitcher
 from textual.binding    import Binding
 
 ##############################################################################
 # Rich imports.
-from rich.text import Text
+from rich.console import RenderableType
+from rich.text    import Text
 
 ##############################################################################
 # Local imports.
-from ..data import load, Scale, Feelings
+from ..              import changes, daemon
+from ..data          import Scale, Feelings, feeling_files
+from ..data.feelings import Feeling as Record
+from ..data.lazy     import LazyFeelings
+from ..data.storage  import feelings_home, iter_feelings, load_aggregates, merge_feelings, record_path
+from ..widgets       import Graph
+from .confirm        import Confirm
+from .edit           import Edit
 
 ##############################################################################
 class FeelingItem( ListItem ):
@@ -59,6 +76,47 @@ class FeelingItem( ListItem ):
         super().__init__()
         self._feelings = feelings
 
+    @property
+    def pane( self ) -> str:
+        """The ID of the pane that shows the detail for this item."""
+        return ""
+
+    @property
+    def version( self ) -> int:
+        """The version of the data that the detail for this item shows."""
+        return 0
+
+    @property
+    def details( self ) -> list[ ListItem ]:
+        """The list items that make up the detail for this item."""
+        return []
+
+    @property
+    def ident( self ) -> str:
+        """An ID for the item that's unique within its list."""
+        return self.pane
+
+    def describe( self ) -> tuple[ RenderableType, Scale ]:
+        """Describe the item.
+
+        Returns:
+            The content of the item's label, and the scale to colour it by.
+        """
+        return "", Scale.NEUTRAL
+
+    def compose( self ) -> ComposeResult:
+        """Compose the child widgets."""
+        content, scale = self.describe()
+        yield Label( content, classes=scale.name.lower() )
+
+    def refresh_label( self ) -> None:
+        """Bring the item's label up to date with the data."""
+        content, scale = self.describe()
+        label = self.query_one( Label )
+        label.remove_class( *( other.name.lower() for other in Scale ) )
+        label.add_class( scale.name.lower() )
+        label.update( content )
+
     @staticmethod
     def emoji( scale: Scale ) -> str:
         """Get an emoji to for a given scale.
@@ -97,20 +155,31 @@ class Feeling( FeelingItem ):
         super().__init__( feelings )
         self._key = key
 
-    def compose( self ) -> ComposeResult:
-        """Compose the child widgets."""
+    @property
+    def key( self ) -> str:
+        """The key of the feeling this item shows."""
+        return self._key
+
+    @property
+    def ident( self ) -> str:
+        """An ID for the item that's unique within its list."""
+        return self._key
+
+    def describe( self ) -> tuple[ RenderableType, Scale ]:
+        """Describe the feeling.
+
+        Returns:
+            The content of the item's label, and the scale to colour it by.
+        """
         feeling = self._feelings[ self._key ]
-        yield Label(
-            Text.assemble(
-                Text.from_markup( self.emoji( feeling.feeling ) ),
-                f" {feeling.recorded:%H:%M:%S}",
-                *(
-                    [ f"\n\n{feeling.description}" ]
-                    if feeling.description else []
-                )
-            ),
-            classes=feeling.feeling.name.lower()
-        )
+        return Text.assemble(
+            Text.from_markup( self.emoji( feeling.feeling ) ),
+            f" {feeling.recorded:%H:%M:%S}",
+            *(
+                [ f"\n\n{feeling.description}" ]
+                if feeling.description else []
+            )
+        ), feeling.feeling
 
 ##############################################################################
 class Day( FeelingItem ):
@@ -122,6 +191,21 @@ class Day( FeelingItem ):
         self._month       = month
         self._day         = day
 
+    @property
+    def pane( self ) -> str:
+        """The ID of the pane that shows the feelings for this day."""
+        return f"feelings-{self._year}-{self._month}-{self._day}"
+
+    @property
+    def version( self ) -> int:
+        """The version of the data for this day."""
+        return self._feelings.version( self._year, self._month, self._day )
+
+    @property
+    def details( self ) -> list[ ListItem ]:
+        """The list items that make up the detail for this day."""
+        return [ *self.feelings ]
+
     @property
     def feelings( self ) -> list[ Feeling ]:
         """The feelings recorded for this day."""
@@ -130,15 +214,17 @@ class Day( FeelingItem ):
             for feeling in self._feelings.for_day( self._year, self._month, self._day )
         ]
 
-    def compose( self ) -> ComposeResult:
-        """Compose the child widgets."""
+    def describe( self ) -> tuple[ RenderableType, Scale ]:
+        """Describe the day.
+
+        Returns:
+            The content of the item's label, and the scale to colour it by.
+        """
         scale = self._feelings.day_scale( self._year, self._month, self._day )
-        yield Label(
-            Text.from_markup(
-                f"{self.emoji( scale )} {self._year}-{self._month}-{self._day} "
-                f"{self._feelings.day_value( self._year, self._month, self._day ):6.2f}"
-            ), classes=scale.name.lower()
-        )
+        return Text.from_markup(
+            f"{self.emoji( scale )} {self._year}-{self._month}-{self._day} "
+            f"{self._feelings.day_value( self._year, self._month, self._day ):6.2f}"
+        ), scale
 
 ##############################################################################
 class Month( FeelingItem ):
@@ -149,6 +235,21 @@ class Month( FeelingItem ):
         self._year  = year
         self._month = month
 
+    @property
+    def pane( self ) -> str:
+        """The ID of the pane that shows the days for this month."""
+        return f"days-{self._year}-{self._month}"
+
+    @property
+    def version( self ) -> int:
+        """The version of the data for this month."""
+        return self._feelings.version( self._year, self._month )
+
+    @property
+    def details( self ) -> list[ ListItem ]:
+        """The list items that make up the detail for this month."""
+        return [ *self.days ]
+
     @property
     def days( self ) -> list[ Day ]:
         """The list of recorded days in this month."""
@@ -157,15 +258,17 @@ class Month( FeelingItem ):
             for day in reversed( self._feelings.days( self._year, self._month ) )
         ]
 
-    def compose( self ) -> ComposeResult:
-        """Compose the child widgets."""
+    def describe( self ) -> tuple[ RenderableType, Scale ]:
+        """Describe the month.
+
+        Returns:
+            The content of the item's label, and the scale to colour it by.
+        """
         scale = self._feelings.month_scale( self._year, self._month )
-        yield Label(
-            Text.from_markup(
-                f"{self.emoji( scale )} {self._year}-{self._month} "
-                f"{self._feelings.month_value( self._year, self._month ):6.2f}"
-            ), classes=scale.name.lower()
-        )
+        return Text.from_markup(
+            f"{self.emoji( scale )} {self._year}-{self._month} "
+            f"{self._feelings.month_value( self._year, self._month ):6.2f}"
+        ), scale
 
 ##############################################################################
 class Year( FeelingItem ):
@@ -175,6 +278,21 @@ class Year( FeelingItem ):
         super().__init__( feelings )
         self._year = year
 
+    @property
+    def pane( self ) -> str:
+        """The ID of the pane that shows the months for this year."""
+        return f"months-{self._year}"
+
+    @property
+    def version( self ) -> int:
+        """The version of the data for this year."""
+        return self._feelings.version( self._year )
+
+    @property
+    def details( self ) -> list[ ListItem ]:
+        """The list items that make up the detail for this year."""
+        return [ *self.months ]
+
     @property
     def months( self ) -> list[ Month ]:
         """The list of recorded months in this year."""
@@ -183,34 +301,101 @@ class Year( FeelingItem ):
             for month in reversed( self._feelings.months( self._year ) )
         ]
 
-    def compose( self ) -> ComposeResult:
-        """Compose the child widgets."""
+    def describe( self ) -> tuple[ RenderableType, Scale ]:
+        """Describe the year.
+
+        Returns:
+            The content of the item's label, and the scale to colour it by.
+        """
         scale = self._feelings.year_scale( self._year )
-        yield Label(
-            Text.from_markup(
-                f"{self.emoji( scale )} {self._year} "
-                f"{self._feelings.year_value( self._year ):6.2f}"
-            ), classes=scale.name.lower()
-        )
+        return Text.from_markup(
+            f"{self.emoji( scale )} {self._year} "
+            f"{self._feelings.year_value( self._year ):6.2f}"
+        ), scale
+
+##############################################################################
+def next_year( years: Iterator[ tuple[ str, Iterator[ Record ] ] ] ) -> tuple[ str, list[ Record ] ] | None:
+    """Pull the next year's feelings from a stream of feelings grouped by year.
+
+    Args:
+        years: The stream of feelings, newest first, grouped by year.
+
+    Returns:
+        The year and its feelings, oldest first, or `None` if there are no
+        more years.
+    """
+    if ( year := next( years, None ) ) is None:
+        return None
+    return year[ 0 ], list( year[ 1 ] )[ ::-1 ]
 
 ##############################################################################
 # The main screen.
-class Main( Screen ):
+class Main( Screen ): # pylint:disable=too-many-instance-attributes
     """The main screen for the application."""
 
     BINDINGS = [
         Binding( "escape", "app.quit", "Quit" ),
+        Binding( "e", "edit", "Edit" ),
+        Binding( "d", "delete", "Delete" ),
+        Binding( "g", "toggle_graph", "Graph" ),
+        Binding( "plus", "zoom_in", "Zoom in" ),
+        Binding( "minus", "zoom_out", "Zoom out" ),
+        Binding( "left_square_bracket", "pan(-1)", "Back" ),
+        Binding( "right_square_bracket", "pan(1)", "Forward" ),
     ]
     """The bindings for the main screen."""
 
+    PANE_CACHE_SIZE: Final = 64
+    """The maximum number of month, day and feeling panes to keep built."""
+
     DEFAULT_CSS = """
+    ContentSwitcher {
+        width: 1fr;
+    }
+
     ListView {
         width: 1fr;
         background: $panel;
         border: round $primary;
     }
+
+    #progress {
+        dock: bottom;
+        width: 100%;
+        height: 1;
+        padding: 0 1 0 1;
+        background: $boost;
+        color: $text-muted;
+    }
+
+    #progress.hidden {
+        display: none;
+    }
+
+    #streaks {
+        dock: bottom;
+        width: 100%;
+        height: 1;
+        padding: 0 1 0 1;
+        background: $boost;
+    }
     """
 
+    def __init__( self, budget: int | None=None, homes: Sequence[ Path ] | None=None ) -> None:
+        """Initialise the screen.
+
+        Args:
+            budget: The rough number of bytes of records to hold in memory,
+                or `None` to hold them all.
+            homes: The homes of the stores to show the feelings of, or
+                `None` for just the local store.
+        """
+        super().__init__()
+        self._homes = homes
+        self.data   = Feelings() if budget is None else LazyFeelings( budget, homes )
+        self._loader: Task[ None ] | None = None
+        self._panes: OrderedDict[ str, tuple[ int, ListView ] ] = OrderedDict()
+
     def compose( self ) -> ComposeResult:
         """Compose the screen.
 
@@ -222,20 +407,294 @@ class Main( Screen ):
         with Horizontal():
             with ListView( id="years" ) as years:
                 self.years = years
-            with ListView( id="months" ) as months:
+            with ContentSwitcher( id="months" ) as months:
                 self.months = months
-            with ListView( id="days" ) as days:
+            with ContentSwitcher( id="days" ) as days:
                 self.days = days
-            with ListView( id="feelings" ) as feelings:
+            with ContentSwitcher( id="feelings" ) as feelings:
                 self.feelings = feelings
+        yield Graph( self.data )
+        yield Label( "Loading...", id="progress" )
+        yield Label( id="streaks" )
         yield Footer()
 
-    async def on_mount( self ) -> None:
-        """Populate the display once the DOM is mounted."""
-        self.data = load() # pylint:disable=attribute-defined-outside-init
-        for year in reversed( self.data.years() ):
-            await self.years.append( Year( self.data, year ) )
+    async def load( self ) -> None:
+        """Load the feelings, newest year first, adding each year as it loads.
+
+        Note:
+            If there's a memory budget, only the daily aggregates are
+            loaded up front and the records are loaded as they're looked
+            at. Otherwise, if the daemon is running (and only the local
+            store is being shown) the feelings are taken from it, or else
+            they're loaded from the stores.
+
+            The reading of the records happens in a thread, a year at a
+            time, so that the user can start looking at the most recent
+            year while older years are still being loaded. The records of
+            all of the stores are merged into one stream, newest first, as
+            they're read.
+
+            Any records that can't be loaded are skipped; `feeling fsck`
+            can be used to find and fix them.
+        """
+        progress = self.query_one( "#progress", Label )
+        if isinstance( self.data, LazyFeelings ):
+            await to_thread( self.data.index, await to_thread( load_aggregates, False, self._homes ) )
+            for year in reversed( self.data.years() ):
+                await self.years.append( Year( self.data, year ) )
+        elif self._homes is None and ( held := await to_thread( daemon.feelings ) ) is not None:
+            self.data = self.graph.feelings = held
+            for year in reversed( held.years() ):
+                await self.years.append( Year( self.data, year ) )
+        else:
+            stores = [ await to_thread( feeling_files, home ) for home in self._homes or [ feelings_home() ] ]
+            total  = sum( len( records ) for records in stores )
+            loaded = 0
+            years  = groupby(
+                merge_feelings(
+                    ( iter_feelings( reversed( records ), True ) for records in stores ), newest_first=True
+                ),
+                key=lambda feeling: feeling.year_key
+            )
+            while ( loading := await to_thread( next_year, years ) ) is not None:
+                self.data.add_all( loading[ 1 ] )
+                loaded += len( loading[ 1 ] )
+                await self.years.append( Year( self.data, loading[ 0 ] ) )
+                progress.update( f"Loading... {loaded} of {total} feelings" )
+                self.show_streaks()
+                self.graph.refresh()
+        self.show_streaks()
+        self.graph.refresh()
+        if isinstance( self.data, LazyFeelings ):
+            self.show_cache()
+        else:
+            progress.add_class( "hidden" )
+
+    def show_cache( self ) -> None:
+        """Show the state of the record cache, if there is one."""
+        if isinstance( self.data, LazyFeelings ):
+            self.query_one( "#progress", Label ).update(
+                f"Record cache: {self.data.hits} hits, {self.data.misses} misses, "
+                f"{self.data.evictions} evictions, {self.data.held // 1024}KiB of "
+                f"{self.data.budget // 1024}KiB held"
+            )
+
+    def show_streaks( self ) -> None:
+        """Show a summary of the recording streaks and low runs."""
+        streaks = self.data.streaks
+        self.query_one( "#streaks", Label ).update(
+            f"Current streak: {streaks.current() or 'none'} | "
+            f"Longest streak: {streaks.longest or 'none'} | "
+            f"Gaps: {len( streaks.gaps )} | "
+            f"Runs of 3+ low days: {len( streaks.low_runs() )}"
+        )
+
+    def on_mount( self ) -> None:
+        """Start populating the display once the DOM is mounted."""
         self.years.focus()
+        self._loader = create_task( self.load() )
+
+    def on_unmount( self ) -> None:
+        """Stop any loading that's still going on when the screen goes away."""
+        if self._loader is not None:
+            self._loader.cancel()
+
+    @property
+    def graph( self ) -> Graph:
+        """The graph of feelings over time."""
+        return self.query_one( Graph )
+
+    def action_toggle_graph( self ) -> None:
+        """Toggle the display of the graph."""
+        self.graph.toggle_class( "hidden" )
+
+    def action_zoom_in( self ) -> None:
+        """Zoom the graph in."""
+        self.graph.zoom_in()
+
+    def action_zoom_out( self ) -> None:
+        """Zoom the graph out."""
+        self.graph.zoom_out()
+
+    def action_pan( self, direction: int ) -> None:
+        """Pan the graph.
+
+        Args:
+            direction: The direction to pan in; negative to go back in time.
+        """
+        self.graph.pan( direction )
+
+    @property
+    def highlighted_feeling( self ) -> Record | None:
+        """The feeling highlighted in the focused list of feelings, if there is one.
+
+        Note:
+            When more than the local store is being shown, only the
+            feelings that are held in the local store can be changed, so
+            any other feeling doesn't count.
+        """
+        if not (
+            isinstance( focused := self.focused, ListView ) and focused.parent is self.feelings and
+            isinstance( item := focused.highlighted_child, Feeling )
+        ):
+            return None
+        if ( feeling := self.data.get( item.key ) ) is None:
+            return None
+        return feeling if self._homes is None or record_path( feeling ).exists() else None
+
+    def action_edit( self ) -> None:
+        """Edit the highlighted feeling."""
+        if ( feeling := self.highlighted_feeling ) is None:
+            self.app.bell()
+        else:
+            self.app.push_screen( Edit( feeling, self._edit ) )
+
+    def action_delete( self ) -> None:
+        """Delete the highlighted feeling, once the user has confirmed it."""
+        if ( feeling := self.highlighted_feeling ) is None:
+            self.app.bell()
+        else:
+            self.app.push_screen( Confirm(
+                f"Delete the feeling recorded at {feeling.recorded:%Y-%m-%d %H:%M:%S}?",
+                partial( self._delete, feeling )
+            ) )
+
+    async def _edit( self, feeling: Record ) -> None:
+        """Save an edited feeling and show it.
+
+        Args:
+            feeling: The feeling as it has been edited.
+        """
+        await to_thread( changes.record, feeling )
+        self.data.add( feeling )
+        await self._reflect( feeling )
+
+    async def _delete( self, feeling: Record ) -> None:
+        """Delete a feeling and stop showing it.
+
+        Args:
+            feeling: The feeling to delete.
+        """
+        await to_thread( changes.delete, feeling )
+        self.data.remove( feeling.key )
+        await self._reflect( feeling )
+
+    async def _reflected_pane( self, column: ContentSwitcher, period: tuple[ str, ... ] ) -> ListView | None:
+        """Get the built pane that shows a period, after a change within the period.
+
+        Args:
+            column: The column that the pane lives in.
+            period: The year, month and day keys of the period the pane shows.
+
+        Returns:
+            The pane, or `None` if it isn't built, or if it was thrown away
+            because nothing is left in the period.
+        """
+        if ( cached := self._panes.get( pane_id := "-".join( ( str( column.id ), *period ) ) ) ) is None:
+            return None
+        if not self.data.tally( *period ).count:
+            if column.current == pane_id:
+                column.current = None
+            await self._panes.pop( pane_id )[ 1 ].remove()
+            return None
+        self._panes[ pane_id ] = ( self.data.version( *period ), cached[ 1 ] )
+        return cached[ 1 ]
+
+    async def _reflect( self, feeling: Record ) -> None:
+        """Bring the display up to date after a feeling has been edited or deleted.
+
+        Args:
+            feeling: The feeling that was edited or deleted.
+
+        Note:
+            Only the items and panes that lead down to the feeling are
+            touched. Items are refreshed in place, or removed if there's
+            nothing left for them to show, so that the highlights stay where
+            they are wherever possible.
+        """
+        year, month, day = feeling.year_key, feeling.month_key, feeling.day_key
+        for pane, ident, exists in (
+            ( self.years, f"months-{year}", self.data.tally( year ).count ),
+            (
+                await self._reflected_pane( self.months, ( year, ) ),
+                f"days-{year}-{month}", self.data.tally( year, month ).count
+            ),
+            (
+                await self._reflected_pane( self.days, ( year, month ) ),
+                f"feelings-{year}-{month}-{day}", self.data.tally( year, month, day ).count
+            ),
+            (
+                await self._reflected_pane( self.feelings, ( year, month, day ) ),
+                feeling.key, feeling.key in self.data
+            )
+        ):
+            if pane is None:
+                continue
+            for item in pane.children:
+                if isinstance( item, FeelingItem ) and item.ident == ident:
+                    if exists:
+                        item.refresh_label()
+                    else:
+                        await item.remove()
+                        # Put the highlight back within the list, which
+                        # also has the columns to the right catch up.
+                        pane.index = pane.index
+                    break
+        self.show_streaks()
+        self.graph.refresh()
+
+    @property
+    def loading( self ) -> bool:
+        """Is the screen still loading the feelings?"""
+        return self._loader is None or not self._loader.done()
+
+    async def _evict_panes( self ) -> None:
+        """Remove the least-recently-used panes if the cache is too big.
+
+        Note:
+            Panes that are currently on display are never removed.
+        """
+        showing = { self.months.current, self.days.current, self.feelings.current }
+        for pane_id in [ pane_id for pane_id in self._panes if pane_id not in showing ]:
+            if len( self._panes ) <= self.PANE_CACHE_SIZE:
+                break
+            await self._panes.pop( pane_id )[ 1 ].remove()
+
+    async def show_pane( self, column: ContentSwitcher, item: FeelingItem | None ) -> ListItem | None:
+        """Show the pane that holds the details for the given item.
+
+        Args:
+            column: The column in which to show the pane.
+            item: The item to show the details for, or `None` if no item active.
+
+        Returns:
+            The highlighted item within the pane that is now showing.
+
+        Note:
+            Panes are built the first time they're needed and are then kept
+            around and reused, so long as the data they show hasn't changed
+            since they were built.
+        """
+        if item is None:
+            column.current = None
+            return None
+        version = item.version
+        if ( cached := self._panes.get( item.pane ) ) is not None and cached[ 0 ] != version:
+            if column.current == item.pane:
+                column.current = None
+            await self._panes.pop( item.pane )[ 1 ].remove()
+            cached = None
+        if cached is None:
+            pane = ListView( *item.details, id=item.pane )
+            pane.display = False
+            await column.mount( pane )
+            self._panes[ item.pane ] = ( version, pane )
+        else:
+            pane = cached[ 1 ]
+        self._panes.move_to_end( item.pane )
+        column.current = item.pane
+        await self._evict_panes()
+        return pane.highlighted_child
 
     async def show_year( self, year: ListItem | None ) -> None:
         """Show the data for the given year.
@@ -243,11 +702,8 @@ class Main( Screen ):
         Args:
             year: The year to show the data for, or `None` if no year active.
         """
-        await self.months.clear()
-        if year is not None:
-            assert isinstance( year, Year )
-            for month in year.months:
-                await self.months.append( month )
+        assert year is None or isinstance( year, Year )
+        await self.show_month( await self.show_pane( self.months, year ) )
 
     async def show_month( self, month: ListItem | None ) -> None:
         """Show the data for the given month.
@@ -255,11 +711,8 @@ class Main( Screen ):
         Args:
             month: The month to show the data for, or `None` if no month active.
         """
-        await self.days.clear()
-        if month is not None:
-            assert isinstance( month, Month )
-            for day in month.days:
-                await self.days.append( day )
+        assert month is None or isinstance( month, Month )
+        await self.show_day( await self.show_pane( self.days, month ) )
 
     async def show_day( self, day: ListItem | None ) -> None:
         """Show the data for the given day.
@@ -267,11 +720,9 @@ class Main( Screen ):
         Args:
             day: The day to show the data for, or `None` if no day active.
         """
-        await self.feelings.clear()
-        if day is not None:
-            assert isinstance( day, Day )
-            for feeling in day.feelings:
-                await self.feelings.append( feeling )
+        assert day is None or isinstance( day, Day )
+        await self.show_pane( self.feelings, day )
+        self.show_cache()
 
     async def on_list_view_highlighted( self, event: ListView.Highlighted ) -> None:
         """Handle list view highlight events.
@@ -279,13 +730,21 @@ class Main( Screen ):
         Args:
             event: The ListView highlight event to handle.
         """
-        if event.list_view.id is not None:
+        # Work out which column the list lives in; if it's a pane that
+        # isn't on display any more the highlight is old news.
+        column = event.list_view.parent
+        if isinstance( column, ContentSwitcher ):
+            if column.current != event.list_view.id:
+                return
+        else:
+            column = event.list_view
+        if column.id is not None:
             try:
                 await {
                     "years": self.show_year,
                     "months": self.show_month,
                     "days": self.show_day
-                }[ event.list_view.id ]( event.item )
+                }[ column.id ]( event.item )
             except KeyError:
                 pass
 
@@ -0,0 +1,11 @@
+"""Widgets for the application."""
+
+##############################################################################
+# Import the widgets for the app.
+from .graph import Graph
+
+##############################################################################
+# Export them.
+__all__ = [ "Graph" ]
+
+### __init__.py ends here
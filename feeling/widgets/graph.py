@@ -0,0 +1,192 @@
+"""A graph of feelings over time."""
+
+##############################################################################
+# Python imports.
+from datetime import datetime
+from typing   import Final
+
+##############################################################################
+# Textual imports.
+from textual.widget import Widget
+
+##############################################################################
+# Rich imports.
+from rich.console import RenderableType
+from rich.text    import Text
+
+##############################################################################
+# Local imports.
+from ..data import Feelings, Resolution, Scale, Tally
+
+##############################################################################
+class Graph( Widget ):
+    """A graph of feelings over time, that can be zoomed and panned.
+
+    Each column of the graph is one bucket of time, at the current
+    resolution. The bar in the column shows the mean feeling for that
+    bucket, and the dotted line above it reaches up to the highest feeling.
+    """
+
+    DEFAULT_CSS = """
+    Graph {
+        dock: bottom;
+        height: 12;
+        background: $panel;
+        border: round $primary;
+    }
+
+    Graph.hidden {
+        display: none;
+    }
+    """
+
+    BARS: Final = "▁▂▃▄▅▆▇█"
+    """The characters used to draw the bars, shortest first."""
+
+    COLOURS: Final = {
+        Scale.VERY_LOW: "red",
+        Scale.LOW: "#ff5f00",
+        Scale.NEUTRAL: "#008700",
+        Scale.GOOD: "#00d700",
+        Scale.VERY_GOOD: "#00ff5f"
+    }
+    """The colours of the bars for each scale."""
+
+    def __init__( self, feelings: Feelings, id: str | None=None ) -> None: # pylint:disable=redefined-builtin
+        """Initialise the graph.
+
+        Args:
+            feelings: The feelings to graph.
+            id: The ID of the graph.
+        """
+        super().__init__( id=id )
+        self.feelings          = feelings
+        self._resolution       = Resolution.MONTH
+        self._last: int | None = None
+
+    @property
+    def resolution( self ) -> Resolution:
+        """The resolution the graph is being shown at."""
+        # The feelings may not hold tallies as fine as the resolution that
+        # was last asked for, so never go finer than they have.
+        finest = self.feelings.pyramid.finest
+        return finest if self._resolution.depth > finest.depth else self._resolution
+
+    @property
+    def last( self ) -> int:
+        """The number of the last bucket on display."""
+        if self._last is not None:
+            return self._last
+        if ( extent := self.feelings.pyramid.extent( self.resolution ) ) is not None:
+            return extent[ 1 ]
+        return self.resolution.bucket( datetime.now() )
+
+    def zoom( self, resolution: Resolution | None ) -> None:
+        """Zoom the graph to a different resolution.
+
+        Args:
+            resolution: The resolution to zoom to.
+
+        Note:
+            The last bucket on display stays in view. If the resolution is
+            `None`, or finer than the feelings are tallied at, nothing
+            happens.
+        """
+        if resolution is None or resolution.depth > self.feelings.pyramid.finest.depth:
+            return
+        if self._last is not None:
+            last  = self.resolution.convert( self._last, resolution )
+            final = self.feelings.pyramid.extent( resolution )
+            self._last = None if final is None or last >= final[ 1 ] else last
+        self._resolution = resolution
+        self.refresh()
+
+    def zoom_in( self ) -> None:
+        """Zoom the graph in to the next finer resolution."""
+        self.zoom( self.resolution.finer )
+
+    def zoom_out( self ) -> None:
+        """Zoom the graph out to the next coarser resolution."""
+        self.zoom( self.resolution.coarser )
+
+    def pan( self, direction: int ) -> None:
+        """Pan the graph by half of its width.
+
+        Args:
+            direction: The direction to pan in; negative to go back in time.
+
+        Note:
+            Panning forward to the latest feelings has the graph follow
+            any new feelings as they're added.
+        """
+        if ( extent := self.feelings.pyramid.extent( self.resolution ) ) is None:
+            return
+        last = self.last + ( direction * max( self.content_size.width // 2, 1 ) )
+        self._last = None if last >= extent[ 1 ] else max( last, extent[ 0 ] )
+        self.refresh()
+
+    def _height( self, value: float, rows: int ) -> int:
+        """Get the height of a bar for a given value.
+
+        Args:
+            value: The value to get the height for.
+            rows: The number of rows available for the bar.
+
+        Returns:
+            The height of the bar, in eighths of a row.
+        """
+        span = Scale.VERY_GOOD.value - Scale.VERY_LOW.value
+        return max( 1, round( ( value - Scale.VERY_LOW.value ) / span * rows * len( self.BARS ) ) )
+
+    def _title( self, first: int, last: int, window: list[ Tally | None ] ) -> Text:
+        """Make the title line of the graph.
+
+        Args:
+            first: The first bucket on display.
+            last: The last bucket on display.
+            window: The tallies for the buckets on display.
+
+        Returns:
+            The title of the graph.
+        """
+        overall = sum( ( tally for tally in window if tally is not None ), Tally() )
+        title   = Text(
+            f"{self.resolution.value.title()}s, "
+            f"{self.resolution.label( first )} to {self.resolution.label( last )}", style="bold"
+        )
+        if overall.count and overall.lowest is not None and overall.highest is not None:
+            title.append(
+                f" | mean {overall.value:.2f}, range {overall.lowest.value} to "
+                f"{overall.highest.value}, {overall.count} feelings"
+            )
+        title.truncate( self.content_size.width, overflow="ellipsis" )
+        return title
+
+    def render( self ) -> RenderableType:
+        """Render the graph.
+
+        Returns:
+            The graph.
+        """
+        width  = max( self.content_size.width, 1 )
+        rows   = max( self.content_size.height - 1, 1 )
+        last   = self.last
+        first  = last - width + 1
+        window = self.feelings.pyramid.window( self.resolution, first, width )
+        lines  = [ self._title( first, last, window ) ]
+        for row in reversed( range( rows ) ):
+            floor = row * len( self.BARS )
+            line  = Text()
+            for tally in window:
+                if tally is None or tally.highest is None:
+                    line.append( " " )
+                elif ( fill := min( self._height( tally.value, rows ) - floor, len( self.BARS ) ) ) > 0:
+                    line.append( self.BARS[ fill - 1 ], style=self.COLOURS[ tally.scale ] )
+                elif self._height( tally.highest.value, rows ) > floor:
+                    line.append( "┊", style=f"dim {self.COLOURS[ tally.highest ]}" )
+                else:
+                    line.append( " " )
+            lines.append( line )
+        return Text( "\n" ).join( lines )
+
+### graph.py ends here